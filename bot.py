@@ -1,7 +1,9 @@
 """
 Telegram Amazing Race Bot - Main bot implementation
 """
+import asyncio
 import logging
+import time
 import yaml
 from datetime import datetime
 from typing import Optional
@@ -16,6 +18,11 @@ from telegram.ext import (
 )
 from game_state import GameState
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml - use the pure-Python loader
+    from yaml import SafeLoader as _Loader
+
 # Configure logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -31,9 +38,18 @@ class AmazingRaceBot:
     # location verification by default, as the photo IS the challenge itself
     PHOTO_BASED_CHALLENGE_TYPES = ['multi_choice', 'team_activity', 'photo', 'scavenger']
     
-    def __init__(self, config_file: str = "config.yml"):
-        """Initialize the bot with configuration."""
-        self.config = self.load_config(config_file)
+    # Maximum number of messages a team broadcast has in flight at once, to stay
+    # clear of Telegram's flood limits
+    BROADCAST_CONCURRENCY = 10
+    
+    def __init__(self, config_file: str = "config.yml", config: Optional[dict] = None):
+        """Initialize the bot with configuration.
+        
+        Args:
+            config_file: Path to the YAML config file
+            config: Already-loaded configuration; when given, config_file is not read
+        """
+        self.config = config if config is not None else self.load_config(config_file)
         self.game_state = GameState()
         self.challenges = self.config['game']['challenges']
         # Support both single admin (new) and list of admins (backward compatibility)
@@ -50,7 +66,7 @@ class AmazingRaceBot:
         """Load configuration from YAML file."""
         try:
             with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_Loader)
         except FileNotFoundError:
             logger.error(f"Config file {config_file} not found!")
             raise
@@ -59,6 +75,56 @@ class AmazingRaceBot:
         """Check if user is an admin."""
         return self.admin_id is not None and user_id == self.admin_id
     
+    @staticmethod
+    async def _safe_send(bot, chat_id: int, text: str, description: str = "message") -> bool:
+        """Send a Markdown message, logging instead of raising if it fails.
+        
+        Returns:
+            True if the message was sent, False otherwise
+        """
+        try:
+            await bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode='Markdown'
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send {description} to user {chat_id}: {e}")
+            return False
+    
+    @staticmethod
+    async def _broadcast_to_teams(bot, teams: dict, text: str, exclude_user_id: Optional[int] = None,
+                                  description: str = "message") -> set:
+        """Send a Markdown message to every member of the given teams.
+        
+        The messages are sent concurrently, at most BROADCAST_CONCURRENCY at a
+        time and once per user, and a failed send does not stop the others.
+        
+        Args:
+            bot: Telegram bot used to send the messages (context.bot)
+            teams: Mapping of team name to team data with a 'members' list
+            text: Message text to send
+            exclude_user_id: Optional user ID to skip (e.g. the admin who already got it)
+            description: What is being sent, for the failure log
+            
+        Returns:
+            Set of user IDs the message was delivered to
+        """
+        # dict.fromkeys drops users listed in more than one team, keeping team order
+        recipients = list(dict.fromkeys(
+            member['id'] for team_data in teams.values() for member in team_data['members']
+            if member['id'] != exclude_user_id
+        ))
+        semaphore = asyncio.Semaphore(AmazingRaceBot.BROADCAST_CONCURRENCY)
+        
+        async def send(user_id):
+            async with semaphore:
+                return await AmazingRaceBot._safe_send(bot, user_id, text, description)
+        
+        results = await asyncio.gather(*(send(user_id) for user_id in recipients))
+        return {user_id for user_id, sent in zip(recipients, results) if sent}
+    
     def validate_image_path(self, image_path: str) -> Optional[str]:
         """Validate a local image path for security.
         
@@ -459,26 +525,19 @@ class AmazingRaceBot:
         # Check if there was a timeout that may have expired
         # Pass the previous challenge config for custom penalty support
         previous_challenge = self.challenges[current_challenge_index - 1]
-        unlock_time_str = self.game_state.get_challenge_unlock_time(team_name, challenge_id, previous_challenge)
-        if not unlock_time_str:
+        unlock_timestamp = self.game_state.get_challenge_unlock_timestamp(team_name, challenge_id, previous_challenge)
+        if unlock_timestamp is None:
             return False
         
-        unlock_time = datetime.fromisoformat(unlock_time_str)
-        now = datetime.now()
-        
         # Check if timeout has expired
-        if now >= unlock_time:
+        if time.time() >= unlock_timestamp:
             # Check if we've already broadcast this unlock
-            broadcasts = team_data.get('challenge_unlock_broadcasts', {})
-            if str(challenge_id) not in broadcasts:
+            if not self.game_state.has_challenge_unlock_broadcast(team_name, challenge_id):
                 # Haven't broadcast yet - do it now
                 await self.broadcast_current_challenge(context, team_name)
                 
                 # Mark as broadcast
-                if 'challenge_unlock_broadcasts' not in team_data:
-                    team_data['challenge_unlock_broadcasts'] = {}
-                team_data['challenge_unlock_broadcasts'][str(challenge_id)] = datetime.now().isoformat()
-                self.game_state.save_state()
+                self.game_state.mark_challenge_unlock_broadcast(team_name, challenge_id)
                 
                 return True
         
@@ -506,8 +565,7 @@ class AmazingRaceBot:
         
         # Check if photo verification is required and not yet done
         if self.requires_photo_verification(challenge, current_challenge_index):
-            photo_verifications = team_data.get('photo_verifications', {})
-            if str(challenge_id) not in photo_verifications:
+            if not self.game_state.is_challenge_photo_verified(team_name, challenge_id):
                 # Photo verification not done yet - don't broadcast challenge details
                 # Instead, notify team that they need to send a photo
                 broadcast_message = (
@@ -1088,7 +1146,7 @@ class AmazingRaceBot:
         
         team = self.game_state.teams[team_name]
         members_list = '\n'.join([f"  • {m['name']}" for m in team['members']])
-        completed = len(team['completed_challenges'])
+        completed = team['num_completed']
         total = len(self.challenges)
         current_challenge = team.get('current_challenge_index', 0) + 1
         
@@ -1145,12 +1203,10 @@ class AmazingRaceBot:
         user = update.effective_user
         team_name = self.game_state.get_team_by_user(user.id)
         
-        completed_challenges = []
         current_challenge_index = 0
         
         if team_name:
             team = self.game_state.teams[team_name]
-            completed_challenges = team['completed_challenges']
             current_challenge_index = team.get('current_challenge_index', 0)
         
         message = "🎯 *Challenges* 🎯\n\n"
@@ -1249,8 +1305,7 @@ class AmazingRaceBot:
         
         # Check if photo verification is required and not yet done
         if self.requires_photo_verification(challenge, current_challenge_index):
-            photo_verifications = team.get('photo_verifications', {})
-            if str(challenge_id) not in photo_verifications:
+            if not self.game_state.is_challenge_photo_verified(team_name, challenge_id):
                 # Photo verification not done yet
                 message = (
                     f"📷 *Photo Verification Required*\n\n"
@@ -1782,8 +1837,7 @@ class AmazingRaceBot:
         
         # Check if photo verification is required and not yet done
         if self.requires_photo_verification(challenge, current_challenge_index):
-            photo_verifications = team.get('photo_verifications', {})
-            if str(challenge_id) not in photo_verifications:
+            if not self.game_state.is_challenge_photo_verified(team_name, challenge_id):
                 # Photo verification not done yet - cannot submit answer
                 message = (
                     f"📷 *Photo Verification Required*\n\n"
@@ -1857,7 +1911,7 @@ class AmazingRaceBot:
                     next_challenge_requires_photo_verification
                 ):
                     team = self.game_state.teams[team_name]
-                    completed = len(team['completed_challenges'])
+                    completed = team['num_completed']
                     total = len(self.challenges)
                     
                     response = (
@@ -1901,8 +1955,7 @@ class AmazingRaceBot:
                             next_challenge_index = team.get('current_challenge_index', 0)
                             next_challenge = self.challenges[next_challenge_index]
                             if self.requires_photo_verification(next_challenge, next_challenge_index):
-                                photo_verifications = team.get('photo_verifications', {})
-                                if str(next_challenge_id) not in photo_verifications:
+                                if not self.game_state.is_challenge_photo_verified(team_name, next_challenge_id):
                                     photo_verification_needed = True
                     
                     # Broadcast completion to team and admin
@@ -2046,29 +2099,10 @@ class AmazingRaceBot:
         await update.message.reply_text(game_start_message, parse_mode='Markdown')
         
         # Broadcast message to all team members and their current challenge
-        sent_to_users = set()  # Track users to avoid duplicate messages
-        admin_is_player = False  # Track if admin is also a player
-        
-        for team_name, team_data in self.game_state.teams.items():
-            for member in team_data['members']:
-                user_id = member['id']
-                # Check if admin is also a player
-                if user_id == user.id:
-                    admin_is_player = True
-                # Skip if already sent to this user
-                if user_id in sent_to_users:
-                    continue
-                
-                try:
-                    await context.bot.send_message(
-                        chat_id=user_id,
-                        text=game_start_message,
-                        parse_mode='Markdown'
-                    )
-                    sent_to_users.add(user_id)
-                except Exception as e:
-                    logger.error(f"Failed to send game start message to user {user_id}: {e}")
-                    # Continue sending to other users even if one fails
+        await self._broadcast_to_teams(context.bot, self.game_state.teams, game_start_message,
+                                       description="game start message")
+        # Check if admin is also a player
+        admin_is_player = self.game_state.get_team_by_user(user.id) is not None
         
         # Broadcast current challenge to all teams (excluding admin only if admin is not a player)
         for team_name in self.game_state.teams.keys():
@@ -2114,25 +2148,9 @@ class AmazingRaceBot:
         # Send message to admin
         await update.message.reply_text(message, parse_mode='Markdown')
         
-        # Broadcast message to all team members
-        sent_to_users = set()  # Track users to avoid duplicate messages
-        for team_name, team_data in self.game_state.teams.items():
-            for member in team_data['members']:
-                user_id = member['id']
-                # Skip if already sent (e.g., admin is also a team member)
-                if user_id in sent_to_users or user_id == user.id:
-                    continue
-                
-                try:
-                    await context.bot.send_message(
-                        chat_id=user_id,
-                        text=message,
-                        parse_mode='Markdown'
-                    )
-                    sent_to_users.add(user_id)
-                except Exception as e:
-                    logger.error(f"Failed to send game end message to user {user_id}: {e}")
-                    # Continue sending to other users even if one fails
+        # Broadcast message to all team members (the admin already got it above)
+        await self._broadcast_to_teams(context.bot, self.game_state.teams, message, exclude_user_id=user.id,
+                                       description="game end message")
     
     async def reset_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /reset command (admin only)."""
@@ -2184,7 +2202,7 @@ class AmazingRaceBot:
         total_challenges = len(self.challenges)
         
         for team_name, team_data in self.game_state.teams.items():
-            completed = len(team_data['completed_challenges'])
+            completed = team_data['num_completed']
             current_challenge = team_data.get('current_challenge_index', 0) + 1
             members_list = ', '.join([m['name'] for m in team_data['members']])
             
@@ -2342,19 +2360,16 @@ class AmazingRaceBot:
         # Check if photo verification is required for this challenge
         if self.requires_photo_verification(current_challenge, current_challenge_index):
             # Check if photo verification already done for this challenge
-            photo_verifications = team.get('photo_verifications', {})
-            if str(challenge_id) not in photo_verifications:
+            if not self.game_state.is_challenge_photo_verified(team_name, challenge_id):
                 # Photo verification not done yet - this is a location verification photo
                 
                 # Check if there's already a pending verification for this team/challenge
-                pending_verifications = self.game_state.get_pending_photo_verifications()
-                for verification in pending_verifications.values():
-                    if verification['team_name'] == team_name and verification['challenge_id'] == challenge_id:
-                        await update.message.reply_text(
-                            f"⏳ You already have a pending photo verification for this challenge.\n"
-                            f"Please wait for admin approval."
-                        )
-                        return
+                if self.game_state.has_pending_photo_verification(team_name, challenge_id):
+                    await update.message.reply_text(
+                        f"⏳ You already have a pending photo verification for this challenge.\n"
+                        f"Please wait for admin approval."
+                    )
+                    return
                 
                 # Get the photo or video
                 if update.message.photo:
@@ -2776,7 +2791,7 @@ class AmazingRaceBot:
                 next_challenge_requires_photo_verification
             ):
                 team = self.game_state.teams[team_name]
-                completed = len(team['completed_challenges'])
+                completed = team['num_completed']
                 total = len(self.challenges)
                 
                 # Get current photo count
@@ -2869,8 +2884,7 @@ class AmazingRaceBot:
                             next_challenge_index = team.get('current_challenge_index', 0)
                             next_challenge = self.challenges[next_challenge_index]
                             if self.requires_photo_verification(next_challenge, next_challenge_index):
-                                photo_verifications = team.get('photo_verifications', {})
-                                if str(next_challenge_id) not in photo_verifications:
+                                if not self.game_state.is_challenge_photo_verified(team_name, next_challenge_id):
                                     photo_verification_needed = True
                     
                     # Broadcast completion to team and admin (excluding submitter)
@@ -3296,7 +3310,7 @@ class AmazingRaceBot:
         challenge_name = current_challenge['name']
         
         # Check if challenge is already completed
-        if challenge_id in team_data['completed_challenges']:
+        if self.game_state.is_challenge_completed(team_name, challenge_id):
             await update.message.reply_text(
                 f"❌ Team '{team_name}' has already completed Challenge #{challenge_id}!"
             )
@@ -3317,7 +3331,7 @@ class AmazingRaceBot:
             return
         
         # Calculate progress
-        completed = len(team_data['completed_challenges'])
+        completed = team_data['num_completed']
         total = len(self.challenges)
         
         # Send confirmation to admin
@@ -3616,27 +3630,9 @@ class AmazingRaceBot:
         )
         
         # Send message to all team members across all teams
-        sent_to_users = set()
-        success_count = 0
-        
-        for team_name, team_data in self.game_state.teams.items():
-            for member in team_data['members']:
-                member_id = member['id']
-                
-                # Skip if already sent to this user (avoid duplicates if someone is in multiple teams)
-                if member_id in sent_to_users:
-                    continue
-                
-                try:
-                    await context.bot.send_message(
-                        chat_id=member_id,
-                        text=broadcast_message,
-                        parse_mode='Markdown'
-                    )
-                    sent_to_users.add(member_id)
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to send broadcast to user {member_id}: {e}")
+        sent_to_users = await self._broadcast_to_teams(context.bot, self.game_state.teams, broadcast_message,
+                                                       description="broadcast")
+        success_count = len(sent_to_users)
         
         # Send confirmation to admin
         confirmation_msg = (
@@ -3682,12 +3678,16 @@ class AmazingRaceBot:
         """Handle errors."""
         logger.error(f"Update {update} caused error {context.error}")
     
+    async def post_shutdown(self, application: Application):
+        """Persist any pending game state changes when the bot stops."""
+        self.game_state.flush()
+    
     def run(self):
         """Run the bot."""
         # Create application
         application = Application.builder().token(
             self.config['telegram']['bot_token']
-        ).build()
+        ).post_shutdown(self.post_shutdown).build()
         
         # Add command handlers
         application.add_handler(CommandHandler("start", self.start_command))
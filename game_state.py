@@ -1,20 +1,197 @@
 """
 Game state management for the Amazing Race Telegram bot.
 """
+import asyncio
+import functools
+import hashlib
 import json
+import mmap
 import os
+import random
+import time
+import uuid
 from typing import Dict, List, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the standard library
+    orjson = None
+
 # Default penalty per hint in minutes
 DEFAULT_PENALTY_MINUTES = 2
 
+# Compact the mutation journal into a full snapshot after this many ops or seconds
+JOURNAL_COMPACT_OPS = 200
+JOURNAL_COMPACT_SECONDS = 60
+
+# Snapshots at least this large are parsed from a memory map instead of a read() copy
+MMAP_LOAD_BYTES = 4 * 1024 * 1024
+
+# Persisted GameState fields and factories for their default values
+STATE_FIELDS = (
+    ('teams', dict),
+    ('challenges', dict),
+    ('game_started', bool),
+    ('game_ended', bool),
+    ('photo_verification_enabled', lambda: True),
+    ('hint_usage', dict),
+    ('pending_photo_submissions', dict),
+    ('pending_photo_verifications', dict),
+    ('tournaments', dict),
+)
+
+# Dedicated generator for bracket shuffles, independent of the global random state
+_RNG = random.Random()
+
+# Tournament match statuses; a round can advance once no match is pending
+MATCH_PENDING = 'pending'
+MATCH_COMPLETE = 'complete'
+MATCH_BYE = 'bye'
+
+
+# Pre-built string keys for the challenge IDs a game realistically uses
+_CID_STR = [str(i) for i in range(256)]
+
+
+def _cid(challenge_id: int) -> str:
+    """Return the string key used for a challenge ID in JSON-backed dicts."""
+    if 0 <= challenge_id < 256:
+        return _CID_STR[challenge_id]
+    return str(challenge_id)
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_iso(timestamp: str) -> datetime:
+    """Parse an ISO timestamp; stored timestamps repeat, so results are cached."""
+    return datetime.fromisoformat(timestamp)
+
+
+def _challenge_mask(challenge_ids: List[int]) -> int:
+    """Pack challenge IDs into an int bitmask where bit N marks challenge N."""
+    mask = 0
+    for challenge_id in challenge_ids:
+        mask |= 1 << challenge_id
+    return mask
+
+
+def _new_match(team1: str, team2: Optional[str]) -> Dict:
+    """Build a bracket match; a missing opponent (team2=None) is a bye won by team1."""
+    if team2 is None:
+        return {'team1': team1, 'team2': None, 'winner': team1, 'status': MATCH_BYE}
+    return {'team1': team1, 'team2': team2, 'winner': None, 'status': MATCH_PENDING}
+
+
+def _count_pending(matches: List[Dict]) -> int:
+    """Count the matches of a round that still await a winner."""
+    return sum(1 for match in matches if match['status'] == MATCH_PENDING)
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _loads(payload: bytes):
+    """Deserialize JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _snapshot_digest(payload: bytes) -> str:
+    """Return the digest identifying a serialized snapshot."""
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _fsync_dir(path: str) -> None:
+    """Flush the directory entry of a freshly renamed file to disk (POSIX only)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def state_file_paths(state_file: str) -> tuple:
+    """Return every file a GameState keeps for the given state file.
+    
+    Returns:
+        Tuple of (snapshot, journal, audit log) paths
+    """
+    base = os.path.splitext(state_file)[0]
+    return state_file, base + '.log', base + '.audit.log'
+
+
+def _read_snapshot(path: str) -> tuple:
+    """Parse a snapshot file without keeping its raw bytes around.
+    
+    Large files are memory-mapped and handed to orjson as a buffer, so the
+    file contents are never copied into a Python bytes object.
+    
+    Returns:
+        Tuple of (state dictionary, snapshot digest)
+    """
+    with open(path, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= MMAP_LOAD_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view), _snapshot_digest(view)
+        payload = f.read()
+    return _loads(payload), _snapshot_digest(payload)
+
+
+def _apply_journal_op(data: Dict, entry: Dict) -> None:
+    """Apply a single journal entry to a raw state dictionary.
+    
+    Args:
+        data: State dictionary as stored in the snapshot file
+        entry: Journal entry with 'op', 'path' and (for set/append) 'value'
+    """
+    *parents, key = entry['path']
+    target = data
+    for part in parents:
+        target = target.setdefault(part, {})
+    
+    op = entry['op']
+    if op == 'set':
+        target[key] = entry['value']
+    elif op == 'append':
+        target.setdefault(key, []).append(entry['value'])
+    elif op == 'del':
+        target.pop(key, None)
+
+
+def _batch_journal(method):
+    """Decorate a mutator so every op it journals, including from nested calls,
+    is written in a single journal append when the outermost call returns."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._journal_depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._journal_depth -= 1
+            if not self._journal_depth and self._batched_ops:
+                ops, self._batched_ops = self._batched_ops, []
+                self._journal(*ops)
+    return wrapper
+
 
 class GameState:
     """Manages the state of the Amazing Race game."""
     
     def __init__(self, state_file: str = "game_state.json"):
         self.state_file = state_file
+        # Snapshots are written compactly; set GAMESTATE_PRETTY=1 for indented, human-readable files
+        self.pretty = bool(os.environ.get('GAMESTATE_PRETTY'))
         self.teams: Dict[str, Dict] = {}
         self.challenges: Dict[int, Dict] = {}
         self.game_started: bool = False
@@ -24,45 +201,270 @@ class GameState:
         self.pending_photo_submissions: Dict[str, Dict] = {}  # Track pending photo submissions
         self.pending_photo_verifications: Dict[str, Dict] = {}  # Track pending photo verifications for location
         self.tournaments: Dict[int, Dict] = {}  # Track tournament state per challenge ID
-        self.admin_audit_log: List[Dict] = []  # Track admin actions for audit trail
+        self._user_to_team: Dict[int, str] = {}  # Reverse index of team members, rebuilt from teams
+        self._leaderboard_cache: Optional[List[tuple]] = None  # Invalidated when team progress changes
+        self._completed_mask: Dict[str, int] = {}  # Bitmask of each team's completed_challenges (bit N = ID N)
+        self._hint_counts: Dict[str, Dict[str, int]] = {}  # Number of hint_usage records per team/challenge
+        self._checklist_counts: Dict[str, Dict[str, int]] = {}  # Number of checklist items marked done per team/challenge
+        self._round_pending: Dict[int, int] = {}  # Pending matches left in each tournament's current round
+        # Epoch seconds of each challenge_completion_times entry, keyed with the ISO string it came from
+        self._completion_epoch: Dict[str, Dict[str, tuple]] = {}
+        # Last unlock time per (team, previous challenge), with the completion time and penalty it came from
+        self._unlock_cache: Dict[tuple, tuple] = {}
+        # IDs of photo submissions/verifications still awaiting review (dicts used as ordered sets)
+        self._pending_submission_ids: Dict[str, None] = {}
+        self._pending_verification_ids: Dict[str, None] = {}
+        self._generation: Optional[str] = None  # Digest of the snapshot the journal belongs to
+        self._journal_ops = 0
+        self._journal_depth = 0  # Nesting depth of _batch_journal calls
+        self._batched_ops: List[tuple] = []  # Ops held back until the outermost batched call returns
+        self._last_compaction = time.monotonic()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None  # Deferred compaction
+        self._save_view: Dict = {}  # Snapshot dict reused across saves
         self.load_state()
     
+    @property
+    def journal_file(self) -> str:
+        """Append-only journal of mutations since the last full snapshot."""
+        return state_file_paths(self.state_file)[1]
+    
+    @property
+    def audit_file(self) -> str:
+        """Append-only JSON-lines log of admin actions, kept outside the snapshot."""
+        return state_file_paths(self.state_file)[2]
+    
     def load_state(self):
-        """Load game state from file."""
+        """Load game state from file, replaying any journaled mutations."""
         if os.path.exists(self.state_file):
             try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    self.teams = data.get('teams', {})
-                    self.challenges = data.get('challenges', {})
-                    self.game_started = data.get('game_started', False)
-                    self.game_ended = data.get('game_ended', False)
-                    self.photo_verification_enabled = data.get('photo_verification_enabled', True)
-                    self.hint_usage = data.get('hint_usage', {})
-                    self.pending_photo_submissions = data.get('pending_photo_submissions', {})
-                    self.pending_photo_verifications = data.get('pending_photo_verifications', {})
-                    self.tournaments = data.get('tournaments', {})
-                    self.admin_audit_log = data.get('admin_audit_log', [])
+                data, self._generation = _read_snapshot(self.state_file)
+                self._journal_ops = self._replay_journal(data)
+                # Only build default containers for fields missing from the file
+                for field, default_factory in STATE_FIELDS:
+                    setattr(self, field, data[field] if field in data else default_factory())
+                # JSON only has string keys; tournaments are keyed by int challenge ID in memory
+                self.tournaments = {int(challenge_key): tournament
+                                    for challenge_key, tournament in self.tournaments.items()}
+                # Back-fill the completed count for teams saved before it was stored
+                for team_data in self.teams.values():
+                    if 'num_completed' not in team_data:
+                        team_data['num_completed'] = len(team_data['completed_challenges'])
+                # Move an audit log stored inside older snapshots into its own file
+                if data.get('admin_audit_log') and not os.path.exists(self.audit_file):
+                    for entry in data['admin_audit_log']:
+                        self._append_audit(entry)
+                self._rebuild_indexes()
             except Exception as e:
                 print(f"Error loading state: {e}")
+        elif os.path.exists(self.audit_file):
+            # The audit log belongs to a game whose state file is gone
+            os.remove(self.audit_file)
+    
+    @property
+    def admin_audit_log(self) -> List[Dict]:
+        """Admin actions recorded for the audit trail, oldest first."""
+        return list(self.iter_audit_log())
+    
+    def iter_audit_log(self):
+        """Stream admin audit entries from the audit log file, oldest first.
+        
+        Yields:
+            Audit entry dictionaries
+        """
+        if not os.path.exists(self.audit_file):
+            return
+        with open(self.audit_file, 'rb') as f:
+            for line in f:
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    return  # Torn write at the tail of the log
+    
+    def _append_audit(self, entry: Dict) -> None:
+        """Append a single entry to the audit log file."""
+        try:
+            with open(self.audit_file, 'ab') as f:
+                f.write(_dumps(entry) + b'\n')
+        except Exception as e:
+            print(f"Error writing audit log: {e}")
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the in-memory lookup indexes from the loaded state."""
+        self._user_to_team = {}
+        self._reindex_users(member['id'] for team_data in self.teams.values()
+                            for member in team_data['members'])
+        self._completed_mask = {team_name: _challenge_mask(team_data['completed_challenges'])
+                                for team_name, team_data in self.teams.items()}
+        self._hint_counts = {team_name: {challenge_key: len(records)
+                                         for challenge_key, records in team_hints.items()}
+                             for team_name, team_hints in self.hint_usage.items()}
+        self._checklist_counts = {team_name: {challenge_key: sum(1 for done in progress.values() if done)
+                                              for challenge_key, progress
+                                              in team_data.get('checklist_progress', {}).items()}
+                                  for team_name, team_data in self.teams.items()}
+        self._pending_submission_ids = {submission_id: None
+                                        for submission_id, submission in self.pending_photo_submissions.items()
+                                        if submission.get('status') == 'pending'}
+        self._pending_verification_ids = {verification_id: None
+                                          for verification_id, verification in self.pending_photo_verifications.items()
+                                          if verification.get('status') == 'pending'}
+        self._completion_epoch = {team_name: {challenge_key: (completion_time, _parse_iso(completion_time).timestamp())
+                                              for challenge_key, completion_time
+                                              in team_data.get('challenge_completion_times', {}).items()
+                                              if completion_time}
+                                  for team_name, team_data in self.teams.items()}
+        self._round_pending = {challenge_id: _count_pending(tournament['bracket'][tournament['current_round']])
+                               for challenge_id, tournament in self.tournaments.items()
+                               if tournament.get('current_round', 0) < len(tournament.get('bracket', []))}
+        self._unlock_cache = {}
+        self._leaderboard_cache = None
+    
+    def _replay_journal(self, data: Dict) -> int:
+        """Replay the journal on top of a freshly loaded snapshot.
+        
+        The journal is only replayed when its header matches the snapshot's
+        generation, so a journal left behind by an older snapshot is ignored.
+        
+        Args:
+            data: Snapshot dictionary to apply the journaled mutations to
+            
+        Returns:
+            Number of journal entries replayed
+        """
+        if not self._generation or not os.path.exists(self.journal_file):
+            return 0
+        
+        replayed = 0
+        with open(self.journal_file, 'r+b') as f:
+            header = f.readline()
+            try:
+                if not header or _loads(header).get('generation') != self._generation:
+                    return 0
+            except ValueError:
+                return 0  # Torn header - treat the journal as stale
+            good_offset = len(header)  # End of the last intact line
+            terminated = header.endswith(b'\n')
+            for line in f:
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    break  # Torn write at the tail of the journal
+                _apply_journal_op(data, entry)
+                replayed += 1
+                good_offset += len(line)
+                terminated = line.endswith(b'\n')
+            
+            # Cut off a torn tail and terminate the last entry, so later appends
+            # start on a fresh line instead of merging into the broken one
+            if good_offset != f.seek(0, os.SEEK_END) or not terminated:
+                f.seek(good_offset)
+                f.truncate()
+                if not terminated:
+                    f.write(b'\n')
+        return replayed
+    
+    def _journal(self, *ops: tuple) -> None:
+        """Persist mutations by appending them to the journal.
+        
+        Each op is a tuple of (op, path) or (op, path, value) where op is one of
+        'set', 'append' or 'del' and path is the list of keys from the top-level
+        state to the changed value. The journal is compacted into a full snapshot
+        once it grows past JOURNAL_COMPACT_OPS entries or JOURNAL_COMPACT_SECONDS.
+        
+        Args:
+            *ops: Mutations to record
+        """
+        if self._journal_depth:
+            self._batched_ops.extend(ops)
+            return
+        
+        if self._generation is None:
+            # No snapshot to journal against yet - write a full one
+            self.save_state()
+            return
+        
+        try:
+            lines = []
+            if self._journal_ops == 0:
+                lines.append(_dumps({'generation': self._generation}))
+            for op in ops:
+                entry = {'op': op[0], 'path': op[1]}
+                if len(op) > 2:
+                    entry['value'] = op[2]
+                lines.append(_dumps(entry))
+            
+            with open(self.journal_file, 'wb' if self._journal_ops == 0 else 'ab') as f:
+                f.write(b'\n'.join(lines) + b'\n')
+            self._journal_ops += len(ops)
+        except Exception as e:
+            print(f"Error writing journal: {e}")
+            return
+        
+        if (self._journal_ops >= JOURNAL_COMPACT_OPS or
+                time.monotonic() - self._last_compaction >= JOURNAL_COMPACT_SECONDS):
+            self.save_state()
+        else:
+            self._schedule_flush()
+    
+    def _schedule_flush(self) -> None:
+        """Schedule a compaction on the running event loop after a burst of mutations.
+        
+        Without a running loop (scripts, synchronous tests) compaction only happens
+        inline from _journal or through an explicit flush().
+        """
+        if self._flush_handle is not None:
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_handle = loop.call_later(JOURNAL_COMPACT_SECONDS, self.flush)
+    
+    def flush(self) -> None:
+        """Compact any journaled mutations into a full snapshot.
+        
+        Called on shutdown and after bulk operations so the state file is
+        up to date without needing a journal replay.
+        """
+        if self._journal_ops:
+            self.save_state()
+    
+    def dump_state(self, pretty: bool = False) -> bytes:
+        """Serialize the in-memory game state, as it would be written to the snapshot."""
+        # Fields may be rebound (e.g. reset_game or direct flag assignment), so
+        # refresh the reused view rather than trusting the references it holds
+        data = self._save_view
+        for field, _ in STATE_FIELDS:
+            data[field] = getattr(self, field)
+        return _dumps(data, indent=pretty)
     
     def save_state(self):
-        """Save game state to file."""
+        """Save a full snapshot of the game state to file and truncate the journal.
+        
+        The snapshot is written to a temporary file, synced to disk and atomically
+        moved into place, and the write is skipped when the serialized state is
+        unchanged.
+        """
         try:
-            data = {
-                'teams': self.teams,
-                'challenges': self.challenges,
-                'game_started': self.game_started,
-                'game_ended': self.game_ended,
-                'photo_verification_enabled': self.photo_verification_enabled,
-                'hint_usage': self.hint_usage,
-                'pending_photo_submissions': self.pending_photo_submissions,
-                'pending_photo_verifications': self.pending_photo_verifications,
-                'tournaments': self.tournaments,
-                'admin_audit_log': self.admin_audit_log
-            }
-            with open(self.state_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            payload = self.dump_state(pretty=self.pretty)
+            digest = _snapshot_digest(payload)
+            if digest != self._generation or not os.path.exists(self.state_file):
+                tmp_file = self.state_file + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.state_file)
+                _fsync_dir(self.state_file)
+                self._generation = digest
+            self._journal_ops = 0
+            self._last_compaction = time.monotonic()
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
         except Exception as e:
             print(f"Error saving state: {e}")
     
@@ -77,10 +479,14 @@ class GameState:
             'members': [{'id': captain_id, 'name': captain_name}],
             'current_challenge_index': 0,
             'completed_challenges': [],
+            'num_completed': 0,
             'finish_time': None,
             'created_at': datetime.now().isoformat()
         }
-        self.save_state()
+        self._user_to_team.setdefault(captain_id, team_name)
+        self._completed_mask[team_name] = 0
+        self._leaderboard_cache = None
+        self._journal(('set', ['teams', team_name], self.teams[team_name]))
         return True
     
     def join_team(self, team_name: str, user_id: int, user_name: str) -> bool:
@@ -89,17 +495,16 @@ class GameState:
             return False
         
         # Check if user is already in a team
-        for team in self.teams.values():
-            if any(member['id'] == user_id for member in team['members']):
-                return False
+        if user_id in self._user_to_team:
+            return False
         
-        self.teams[team_name]['members'].append({
-            'id': user_id,
-            'name': user_name
-        })
-        self.save_state()
+        member = {'id': user_id, 'name': user_name}
+        self.teams[team_name]['members'].append(member)
+        self._user_to_team.setdefault(user_id, team_name)
+        self._journal(('append', ['teams', team_name, 'members'], member))
         return True
     
+    @_batch_journal
     def complete_challenge(self, team_name: str, challenge_id: int, total_challenges: int, 
                           submission_data: Optional[Dict] = None, 
                           next_challenge_requires_photo_verification: bool = None) -> bool:
@@ -116,24 +521,32 @@ class GameState:
         Returns:
             True if challenge was successfully completed, False otherwise
         """
-        if team_name not in self.teams:
-            return False
-        
-        if challenge_id in self.teams[team_name]['completed_challenges']:
+        team_data = self.teams.get(team_name)
+        if team_data is None:
             return False
-        
+        return self._complete_challenge(team_name, team_data, challenge_id, total_challenges,
+                                        submission_data, next_challenge_requires_photo_verification)
+    
+    def _complete_challenge(self, team_name: str, team_data: Dict, challenge_id: int, total_challenges: int,
+                            submission_data: Optional[Dict],
+                            next_challenge_requires_photo_verification: Optional[bool]) -> bool:
+        """Complete a challenge for a team whose record the caller has already looked up."""
         # Get the current challenge index (0-based)
-        current_index = self.teams[team_name]['current_challenge_index']
+        current_index = team_data['current_challenge_index']
         
         # Challenge IDs are 1-based, so expected challenge ID is current_index + 1
         expected_challenge_id = current_index + 1
         
-        # Only allow completing the next sequential challenge
+        # Only allow completing the next sequential challenge; this also rejects
+        # already completed challenges, which all lie below the current index
         if challenge_id != expected_challenge_id:
             return False
         
-        self.teams[team_name]['completed_challenges'].append(challenge_id)
-        self.teams[team_name]['current_challenge_index'] += 1
+        now = datetime.now().isoformat()
+        team_data['completed_challenges'].append(challenge_id)
+        self._completed_mask[team_name] |= 1 << challenge_id
+        team_data['num_completed'] += 1
+        team_data['current_challenge_index'] += 1
         
         # Record completion time for penalty tracking
         # When the next challenge requires photo verification and this is not the last challenge,
@@ -153,21 +566,52 @@ class GameState:
         
         if not should_defer:
             # No photo verification OR last challenge - set completion time immediately
-            self.set_challenge_completion_time(team_name, challenge_id)
+            self._set_completion_time(team_name, team_data, challenge_id, now)
         
         # Store submission data if provided
         if submission_data:
-            if 'challenge_submissions' not in self.teams[team_name]:
-                self.teams[team_name]['challenge_submissions'] = {}
-            self.teams[team_name]['challenge_submissions'][str(challenge_id)] = submission_data
+            team_data.setdefault('challenge_submissions', {})[_cid(challenge_id)] = submission_data
         
-        # Check if team finished all challenges
-        if len(self.teams[team_name]['completed_challenges']) >= total_challenges:
-            self.teams[team_name]['finish_time'] = datetime.now().isoformat()
+        # Check if team finished all challenges (completion is sequential, so the
+        # index equals the number of completed challenges)
+        if team_data['current_challenge_index'] >= total_challenges:
+            team_data['finish_time'] = now
         
-        self.save_state()
+        self._leaderboard_cache = None
+        self._journal(*self._progress_ops(team_name, challenge_id))
         return True
     
+    def _progress_ops(self, team_name: str, challenge_id: int) -> List[tuple]:
+        """Build the journal ops for a team having just completed a challenge.
+        
+        Only the progress fields touched by a completion are journaled rather
+        than the whole team record, which grows with every submission.
+        """
+        team_data = self.teams[team_name]
+        challenge_key = _cid(challenge_id)
+        path = ['teams', team_name]
+        ops = [('append', path + ['completed_challenges'], challenge_id),
+               ('set', path + ['num_completed'], team_data['num_completed']),
+               ('set', path + ['current_challenge_index'], team_data['current_challenge_index']),
+               ('set', path + ['finish_time'], team_data.get('finish_time'))]
+        submission = team_data.get('challenge_submissions', {}).get(challenge_key)
+        if submission is not None:
+            ops.append(('set', path + ['challenge_submissions', challenge_key], submission))
+        return ops
+    
+    def is_challenge_completed(self, team_name: str, challenge_id: int) -> bool:
+        """Check whether a team has completed a challenge.
+        
+        Args:
+            team_name: Name of the team
+            challenge_id: ID of the challenge
+            
+        Returns:
+            True if the team exists and has completed the challenge
+        """
+        return challenge_id >= 0 and (self._completed_mask.get(team_name, 0) >> challenge_id) & 1 == 1
+    
+    @_batch_journal
     def pass_team(self, team_name: str, total_challenges: int, admin_id: int, admin_name: str) -> bool:
         """Manually advance a team past the current challenge (admin override).
         
@@ -199,32 +643,35 @@ class GameState:
         challenge_id = current_index + 1
         
         # Check if challenge is already completed
-        if challenge_id in team_data['completed_challenges']:
+        if self.is_challenge_completed(team_name, challenge_id):
             return False
         
         # Mark challenge as completed with admin override data
+        now = datetime.now().isoformat()
         submission_data = {
             'type': 'admin_pass',
             'admin_id': admin_id,
             'admin_name': admin_name,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'reason': 'Manual admin override using /pass command'
         }
         
         team_data['completed_challenges'].append(challenge_id)
+        self._completed_mask[team_name] |= 1 << challenge_id
+        team_data['num_completed'] += 1
         team_data['current_challenge_index'] += 1
         
         # Set completion time (no photo verification deferral for admin pass)
-        self.set_challenge_completion_time(team_name, challenge_id)
+        self._set_completion_time(team_name, team_data, challenge_id, now)
         
         # Store submission data
-        if 'challenge_submissions' not in team_data:
-            team_data['challenge_submissions'] = {}
-        team_data['challenge_submissions'][str(challenge_id)] = submission_data
+        team_data.setdefault('challenge_submissions', {})[_cid(challenge_id)] = submission_data
         
-        # Check if team finished all challenges
-        if len(team_data['completed_challenges']) >= total_challenges:
-            team_data['finish_time'] = datetime.now().isoformat()
+        # Check if team finished all challenges (completion is sequential, so the
+        # index equals the number of completed challenges)
+        if team_data['current_challenge_index'] >= total_challenges:
+            team_data['finish_time'] = now
+        self._leaderboard_cache = None
         
         # Log this action in the audit trail
         audit_entry = {
@@ -233,62 +680,83 @@ class GameState:
             'challenge_id': challenge_id,
             'admin_id': admin_id,
             'admin_name': admin_name,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now
         }
-        self.admin_audit_log.append(audit_entry)
+        self._append_audit(audit_entry)
         
-        self.save_state()
+        self._journal(*self._progress_ops(team_name, challenge_id))
         return True
     
+    def _reindex_users(self, user_ids) -> None:
+        """Point each given user at the first team that lists them, or drop them.
+        
+        A user ID can appear in more than one team (admin-created teams all use
+        captain 0), in which case the earliest team wins, matching a scan of teams.
+        """
+        pending = set(user_ids)
+        for user_id in pending:
+            self._user_to_team.pop(user_id, None)
+        for team_name, team_data in self.teams.items():
+            for member in team_data['members']:
+                if member['id'] in pending:
+                    self._user_to_team.setdefault(member['id'], team_name)
+    
     def get_team_by_user(self, user_id: int) -> Optional[str]:
         """Get the team name for a given user."""
-        for team_name, team_data in self.teams.items():
-            if any(member['id'] == user_id for member in team_data['members']):
-                return team_name
-        return None
+        return self._user_to_team.get(user_id)
     
     def get_leaderboard(self) -> List[tuple]:
-        """Get sorted list of teams by progress and finish time."""
-        # Sort by: finished teams first (by finish time), then by progress
-        def sort_key(item):
-            name, data = item
+        """Get sorted list of teams by progress and finish time.
+        
+        The result is cached until a team's progress, name or membership in the
+        game changes, so callers must not modify the returned list.
+        """
+        if self._leaderboard_cache is not None:
+            return self._leaderboard_cache
+        
+        # Sort by: finished teams first (by finish time), then by progress.
+        # Rows are flat tuples that sort natively; the position keeps ties in team order.
+        rows = []
+        for position, (name, data) in enumerate(self.teams.items()):
             finish_time = data.get('finish_time')
-            num_completed = len(data['completed_challenges'])
+            num_completed = data['num_completed']
             
             # Teams that finished: sort by finish time (earlier is better)
-            if finish_time:
-                return (0, finish_time)
             # Teams still racing: sort by number of completed challenges (more is better)
+            if finish_time:
+                rows.append((0, finish_time, position, name, num_completed))
             else:
-                return (1, -num_completed)
+                rows.append((1, -num_completed, position, name, num_completed))
         
-        sorted_teams = sorted(self.teams.items(), key=sort_key)
-        
-        return [(name, len(data['completed_challenges']), data.get('finish_time')) 
-                for name, data in sorted_teams]
+        rows.sort()
+        self._leaderboard_cache = [(name, num_completed, finish_time if group == 0 else None)
+                                   for group, finish_time, _, name, num_completed in rows]
+        return self._leaderboard_cache
     
     def start_game(self):
         """Start the game."""
         self.game_started = True
-        self.save_state()
+        self._journal(('set', ['game_started'], True))
+        self.flush()
     
     def end_game(self):
         """End the game."""
         self.game_ended = True
-        self.save_state()
+        self._journal(('set', ['game_ended'], True))
+        self.flush()
     
     def reset_game(self):
         """Reset the game state."""
-        self.teams = {}
-        self.challenges = {}
-        self.game_started = False
-        self.game_ended = False
-        self.photo_verification_enabled = True
-        self.hint_usage = {}
-        self.pending_photo_submissions = {}
-        self.pending_photo_verifications = {}
-        self.tournaments = {}
-        self.admin_audit_log = []
+        # Skip the rewrite when the state is already fresh (e.g. repeated /reset)
+        if (all(getattr(self, field) == default_factory() for field, default_factory in STATE_FIELDS)
+                and not os.path.exists(self.audit_file)):
+            return
+        
+        for field, default_factory in STATE_FIELDS:
+            setattr(self, field, default_factory())
+        if os.path.exists(self.audit_file):
+            os.remove(self.audit_file)
+        self._rebuild_indexes()
         self.save_state()
     
     def update_team(self, team_name: str, new_team_name: str = None, 
@@ -298,24 +766,30 @@ class GameState:
             return False
         
         team_data = self.teams[team_name]
+        rename = bool(new_team_name) and new_team_name != team_name
+        if rename and new_team_name in self.teams:
+            return False  # New name already exists - leave the team untouched
         
         # Update captain if provided
         if new_captain_id is not None and new_captain_name is not None:
-            # Update captain in members list
-            for member in team_data['members']:
-                if member['id'] == team_data['captain_id']:
-                    break
             team_data['captain_id'] = new_captain_id
             team_data['captain_name'] = new_captain_name
         
         # Rename team if new name provided
-        if new_team_name and new_team_name != team_name:
-            if new_team_name in self.teams:
-                return False  # New name already exists
+        if rename:
             self.teams[new_team_name] = team_data
             del self.teams[team_name]
-        
-        self.save_state()
+            # The renamed team moves to the end of the team order
+            self._reindex_users(member['id'] for member in team_data['members'])
+            self._completed_mask[new_team_name] = self._completed_mask.pop(team_name)
+            self._completion_epoch[new_team_name] = self._completion_epoch.pop(team_name, {})
+            self._checklist_counts[new_team_name] = self._checklist_counts.pop(team_name, {})
+            self._leaderboard_cache = None
+            self._journal(('del', ['teams', team_name]),
+                          ('set', ['teams', new_team_name], team_data))
+        elif new_captain_id is not None and new_captain_name is not None:
+            self._journal(('set', ['teams', team_name, 'captain_id'], new_captain_id),
+                          ('set', ['teams', team_name, 'captain_name'], new_captain_name))
         return True
     
     def remove_team(self, team_name: str) -> bool:
@@ -323,8 +797,14 @@ class GameState:
         if team_name not in self.teams:
             return False
         
+        members = self.teams[team_name]['members']
+        del self._completed_mask[team_name]
+        self._completion_epoch.pop(team_name, None)
+        self._checklist_counts.pop(team_name, None)
         del self.teams[team_name]
-        self.save_state()
+        self._reindex_users(member['id'] for member in members)
+        self._leaderboard_cache = None
+        self._journal(('del', ['teams', team_name]))
         return True
     
     def add_member_to_team(self, team_name: str, user_id: int, user_name: str, max_team_size: int) -> bool:
@@ -333,19 +813,17 @@ class GameState:
             return False
         
         # Check if user is already in any team
-        for team in self.teams.values():
-            if any(member['id'] == user_id for member in team['members']):
-                return False
+        if user_id in self._user_to_team:
+            return False
         
         # Check team size limit
         if len(self.teams[team_name]['members']) >= max_team_size:
             return False
         
-        self.teams[team_name]['members'].append({
-            'id': user_id,
-            'name': user_name
-        })
-        self.save_state()
+        member = {'id': user_id, 'name': user_name}
+        self.teams[team_name]['members'].append(member)
+        self._user_to_team.setdefault(user_id, team_name)
+        self._journal(('append', ['teams', team_name, 'members'], member))
         return True
     
     def remove_member_from_team(self, team_name: str, user_id: int) -> bool:
@@ -359,15 +837,27 @@ class GameState:
         if team['captain_id'] == user_id and len(team['members']) == 1:
             return False
         
-        # Remove the member
-        team['members'] = [m for m in team['members'] if m['id'] != user_id]
+        # Remove the member in place; member IDs are unique within a team
+        members = team['members']
+        ops = []
+        for index, member in enumerate(members):
+            if member['id'] == user_id:
+                del members[index]
+                if self._user_to_team.get(user_id) == team_name:
+                    self._reindex_users([user_id])
+                ops.append(('set', ['teams', team_name, 'members'], members))
+                break
         
-        # If captain was removed, assign new captain
-        if team['captain_id'] == user_id and team['members']:
-            team['captain_id'] = team['members'][0]['id']
-            team['captain_name'] = team['members'][0]['name']
+        # If captain was removed, assign new captain (the captain may not be
+        # listed as a member after update_team, so check even if nothing was deleted)
+        if team['captain_id'] == user_id and members:
+            team['captain_id'] = members[0]['id']
+            team['captain_name'] = members[0]['name']
+            ops.append(('set', ['teams', team_name, 'captain_id'], team['captain_id']))
+            ops.append(('set', ['teams', team_name, 'captain_name'], team['captain_name']))
         
-        self.save_state()
+        if ops:
+            self._journal(*ops)
         return True
     
     def toggle_photo_verification(self) -> bool:
@@ -377,7 +867,7 @@ class GameState:
             New state of photo verification (True if enabled, False if disabled)
         """
         self.photo_verification_enabled = not self.photo_verification_enabled
-        self.save_state()
+        self._journal(('set', ['photo_verification_enabled'], self.photo_verification_enabled))
         return self.photo_verification_enabled
     
     def set_photo_verification(self, enabled: bool) -> None:
@@ -387,7 +877,7 @@ class GameState:
             enabled: True to enable, False to disable
         """
         self.photo_verification_enabled = enabled
-        self.save_state()
+        self._journal(('set', ['photo_verification_enabled'], enabled))
     
     def add_pending_photo_verification(self, team_name: str, challenge_id: int, 
                                        photo_id: str, user_id: int, user_name: str) -> str:
@@ -403,7 +893,7 @@ class GameState:
         Returns:
             Verification ID (unique identifier for this verification)
         """
-        verification_id = f"{team_name}_{challenge_id}_{datetime.now().timestamp()}"
+        verification_id = uuid.uuid4().hex
         
         self.pending_photo_verifications[verification_id] = {
             'team_name': team_name,
@@ -414,19 +904,43 @@ class GameState:
             'timestamp': datetime.now().isoformat(),
             'status': 'pending'
         }
+        self._pending_verification_ids[verification_id] = None
         
-        self.save_state()
+        self._journal(('set', ['pending_photo_verifications', verification_id],
+                       self.pending_photo_verifications[verification_id]))
         return verification_id
     
+    def has_pending_photo_verification(self, team_name: str, challenge_id: int) -> bool:
+        """Check whether a team already has a location photo awaiting review.
+        
+        Args:
+            team_name: Name of the team
+            challenge_id: ID of the challenge
+            
+        Returns:
+            True if a pending verification exists for the team and challenge
+        """
+        for verification_id in self._pending_verification_ids:
+            verification = self.pending_photo_verifications[verification_id]
+            if verification['team_name'] == team_name and verification['challenge_id'] == challenge_id:
+                return True
+        return False
+    
     def get_pending_photo_verifications(self) -> Dict[str, Dict]:
         """Get all pending photo verifications for location arrival.
         
         Returns:
             Dictionary of pending verifications
         """
-        return {k: v for k, v in self.pending_photo_verifications.items() 
-                if v.get('status') == 'pending'}
+        return {verification_id: self.pending_photo_verifications[verification_id]
+                for verification_id in self._pending_verification_ids}
     
+    def is_challenge_photo_verified(self, team_name: str, challenge_id: int) -> bool:
+        """Check whether a team's location photo for a challenge has been approved."""
+        team_data = self.teams.get(team_name)
+        return team_data is not None and _cid(challenge_id) in team_data.get('photo_verifications', {})
+    
+    @_batch_journal
     def approve_photo_verification(self, verification_id: str) -> bool:
         """Approve a photo verification for location arrival.
         
@@ -447,31 +961,34 @@ class GameState:
         if team_name not in self.teams:
             return False
         
-        if 'photo_verifications' not in self.teams[team_name]:
-            self.teams[team_name]['photo_verifications'] = {}
-        
-        self.teams[team_name]['photo_verifications'][str(challenge_id)] = {
+        team_data = self.teams[team_name]
+        now = datetime.now().isoformat()
+        photo_verification = {
             'verified_by': verification['user_id'],
             'user_name': verification['user_name'],
             'photo_id': verification['photo_id'],
             'timestamp': verification['timestamp'],
-            'approved_at': datetime.now().isoformat()
+            'approved_at': now
         }
+        challenge_key = _cid(challenge_id)
+        team_data.setdefault('photo_verifications', {})[challenge_key] = photo_verification
         
         # When photo verification is approved, set the completion time for the previous challenge
         # This ensures penalty timeout starts only after photo verification is complete
         previous_challenge_id = challenge_id - 1
         if previous_challenge_id >= 1:
             # Check if previous challenge was completed but completion time was not set
-            if previous_challenge_id in self.teams[team_name]['completed_challenges']:
-                completion_times = self.teams[team_name].get('challenge_completion_times', {})
-                if str(previous_challenge_id) not in completion_times:
+            if self.is_challenge_completed(team_name, previous_challenge_id):
+                completion_times = team_data.get('challenge_completion_times', {})
+                if _cid(previous_challenge_id) not in completion_times:
                     # Set completion time now (penalty timer starts from here)
-                    self.set_challenge_completion_time(team_name, previous_challenge_id)
+                    self._set_completion_time(team_name, team_data, previous_challenge_id, now)
         
         # Mark verification as approved
         self.pending_photo_verifications[verification_id]['status'] = 'approved'
-        self.save_state()
+        self._pending_verification_ids.pop(verification_id, None)
+        self._journal(('set', ['teams', team_name, 'photo_verifications', challenge_key], photo_verification),
+                      ('set', ['pending_photo_verifications', verification_id, 'status'], 'approved'))
         return True
     
     def reject_photo_verification(self, verification_id: str) -> bool:
@@ -488,7 +1005,8 @@ class GameState:
         
         # Mark verification as rejected
         self.pending_photo_verifications[verification_id]['status'] = 'rejected'
-        self.save_state()
+        self._pending_verification_ids.pop(verification_id, None)
+        self._journal(('set', ['pending_photo_verifications', verification_id, 'status'], 'rejected'))
         return True
     
     def get_photo_verification_by_id(self, verification_id: str) -> Optional[Dict]:
@@ -519,24 +1037,19 @@ class GameState:
         if team_name not in self.teams:
             return False
         
-        # Initialize hint_usage for team if not exists
-        if team_name not in self.hint_usage:
-            self.hint_usage[team_name] = {}
-        
-        # Initialize challenge hints if not exists
-        challenge_key = str(challenge_id)
-        if challenge_key not in self.hint_usage[team_name]:
-            self.hint_usage[team_name][challenge_key] = []
-        
-        # Record the hint usage
-        self.hint_usage[team_name][challenge_key].append({
+        # Record the hint usage, initializing the team and challenge entries if needed
+        challenge_key = _cid(challenge_id)
+        record = {
             'hint_index': hint_index,
             'user_id': user_id,
             'user_name': user_name,
             'timestamp': datetime.now().isoformat()
-        })
+        }
+        self.hint_usage.setdefault(team_name, {}).setdefault(challenge_key, []).append(record)
+        team_counts = self._hint_counts.setdefault(team_name, {})
+        team_counts[challenge_key] = team_counts.get(challenge_key, 0) + 1
         
-        self.save_state()
+        self._journal(('append', ['hint_usage', team_name, challenge_key], record))
         return True
     
     def get_used_hints(self, team_name: str, challenge_id: int) -> List[Dict]:
@@ -552,7 +1065,7 @@ class GameState:
         if team_name not in self.hint_usage:
             return []
         
-        challenge_key = str(challenge_id)
+        challenge_key = _cid(challenge_id)
         return self.hint_usage.get(team_name, {}).get(challenge_key, [])
     
     def get_hint_count(self, team_name: str, challenge_id: int) -> int:
@@ -565,7 +1078,7 @@ class GameState:
         Returns:
             Number of hints used
         """
-        return len(self.get_used_hints(team_name, challenge_id))
+        return self._hint_counts.get(team_name, {}).get(_cid(challenge_id), 0)
     
     def get_total_penalty_time(self, team_name: str, challenge_id: int, challenge: Optional[dict] = None) -> int:
         """Get total penalty time in seconds for hints used on a challenge.
@@ -579,6 +1092,8 @@ class GameState:
             Total penalty time in seconds (default: 2 minutes per hint, or custom if specified)
         """
         hint_count = self.get_hint_count(team_name, challenge_id)
+        if not hint_count:
+            return 0  # Common case - no hints used, no penalty to compute
         
         # Get penalty minutes from challenge config, use module constant for default
         penalty_minutes = DEFAULT_PENALTY_MINUTES
@@ -600,21 +1115,53 @@ class GameState:
             return challenge['timeout_penalty_minutes']
         return DEFAULT_PENALTY_MINUTES
     
-    def set_challenge_completion_time(self, team_name: str, challenge_id: int) -> None:
+    def set_challenge_completion_time(self, team_name: str, challenge_id: int,
+                                      completion_time: Optional[str] = None) -> None:
         """Set the completion time for a challenge (used for penalty timing).
         
         Args:
             team_name: Name of the team
             challenge_id: ID of the challenge
+            completion_time: Optional ISO timestamp already taken by the caller (default: now)
         """
-        if team_name not in self.teams:
-            return
+        team_data = self.teams.get(team_name)
+        if team_data is not None:
+            self._set_completion_time(team_name, team_data, challenge_id, completion_time)
+    
+    def _set_completion_time(self, team_name: str, team_data: Dict, challenge_id: int,
+                             completion_time: Optional[str]) -> None:
+        """Record a completion time for a team whose record the caller has already looked up."""
+        if completion_time is None:
+            now = datetime.now()
+            completion_time = now.isoformat()
+        else:
+            now = _parse_iso(completion_time)
+        challenge_key = _cid(challenge_id)
+        team_data.setdefault('challenge_completion_times', {})[challenge_key] = completion_time
+        self._completion_epoch.setdefault(team_name, {})[challenge_key] = (completion_time, now.timestamp())
+        self._journal(('set', ['teams', team_name, 'challenge_completion_times', challenge_key],
+                       completion_time))
+    
+    def has_challenge_unlock_broadcast(self, team_name: str, challenge_id: int) -> bool:
+        """Check whether a challenge's unlock has already been announced to a team."""
+        team_data = self.teams.get(team_name)
+        return team_data is not None and _cid(challenge_id) in team_data.get('challenge_unlock_broadcasts', {})
+    
+    def mark_challenge_unlock_broadcast(self, team_name: str, challenge_id: int) -> None:
+        """Record that a challenge's unlock has been announced to a team.
         
-        if 'challenge_completion_times' not in self.teams[team_name]:
-            self.teams[team_name]['challenge_completion_times'] = {}
+        Args:
+            team_name: Name of the team
+            challenge_id: ID of the challenge that unlocked
+        """
+        team_data = self.teams.get(team_name)
+        if team_data is None:
+            return
         
-        self.teams[team_name]['challenge_completion_times'][str(challenge_id)] = datetime.now().isoformat()
-        self.save_state()
+        challenge_key = _cid(challenge_id)
+        timestamp = datetime.now().isoformat()
+        team_data.setdefault('challenge_unlock_broadcasts', {})[challenge_key] = timestamp
+        self._journal(('set', ['teams', team_name, 'challenge_unlock_broadcasts', challenge_key], timestamp))
     
     def get_challenge_unlock_time(self, team_name: str, challenge_id: int, previous_challenge: Optional[dict] = None) -> Optional[str]:
         """Get the time when a challenge will be unlocked (after penalty).
@@ -627,6 +1174,23 @@ class GameState:
         Returns:
             ISO format timestamp when challenge unlocks, or None if no penalty
         """
+        unlock = self._get_unlock(team_name, challenge_id, previous_challenge)
+        return unlock[2] if unlock is not None else None
+    
+    def get_challenge_unlock_timestamp(self, team_name: str, challenge_id: int, previous_challenge: Optional[dict] = None) -> Optional[float]:
+        """Get the unlock time of a challenge as epoch seconds.
+        
+        Same as get_challenge_unlock_time, but lets callers that poll the lock
+        compare against time.time() without parsing the ISO string.
+        
+        Returns:
+            Epoch seconds when challenge unlocks, or None if no penalty
+        """
+        unlock = self._get_unlock(team_name, challenge_id, previous_challenge)
+        return unlock[3] if unlock is not None else None
+    
+    def _get_unlock(self, team_name: str, challenge_id: int, previous_challenge: Optional[dict]) -> Optional[tuple]:
+        """Return the memoized (completion_time, penalty_seconds, unlock_iso, unlock_epoch) entry."""
         if team_name not in self.teams:
             return None
         
@@ -636,8 +1200,9 @@ class GameState:
             return None
         
         # Get completion time of previous challenge
+        challenge_key = _cid(previous_challenge_id)
         completion_times = self.teams[team_name].get('challenge_completion_times', {})
-        completion_time_str = completion_times.get(str(previous_challenge_id))
+        completion_time_str = completion_times.get(challenge_key)
         
         if not completion_time_str:
             return None
@@ -648,12 +1213,24 @@ class GameState:
         if penalty_seconds == 0:
             return None
         
-        # Calculate unlock time
-        from datetime import datetime, timedelta
-        completion_time = datetime.fromisoformat(completion_time_str)
-        unlock_time = completion_time + timedelta(seconds=penalty_seconds)
-        
-        return unlock_time.isoformat()
+        # The unlock time only changes with the completion time or the penalty
+        memo_key = (team_name, previous_challenge_id)
+        memo = self._unlock_cache.get(memo_key)
+        if memo is not None and memo[0] == completion_time_str and memo[1] == penalty_seconds:
+            return memo
+        
+        # Calculate unlock time in epoch seconds, parsing the ISO string only if it
+        # changed since it was last seen; convert back to ISO only for the result
+        team_epochs = self._completion_epoch.setdefault(team_name, {})
+        cached = team_epochs.get(challenge_key)
+        if cached is None or cached[0] != completion_time_str:
+            cached = (completion_time_str, _parse_iso(completion_time_str).timestamp())
+            team_epochs[challenge_key] = cached
+        
+        unlock_epoch = cached[1] + penalty_seconds
+        memo = (completion_time_str, penalty_seconds, datetime.fromtimestamp(unlock_epoch).isoformat(), unlock_epoch)
+        self._unlock_cache[memo_key] = memo
+        return memo
     
     def add_pending_photo_submission(self, team_name: str, challenge_id: int, 
                                      photo_id: str, user_id: int, user_name: str) -> str:
@@ -669,7 +1246,7 @@ class GameState:
         Returns:
             Submission ID (unique identifier for this submission)
         """
-        submission_id = f"{team_name}_{challenge_id}_{datetime.now().timestamp()}"
+        submission_id = uuid.uuid4().hex
         
         self.pending_photo_submissions[submission_id] = {
             'team_name': team_name,
@@ -680,8 +1257,10 @@ class GameState:
             'timestamp': datetime.now().isoformat(),
             'status': 'pending'
         }
+        self._pending_submission_ids[submission_id] = None
         
-        self.save_state()
+        self._journal(('set', ['pending_photo_submissions', submission_id],
+                       self.pending_photo_submissions[submission_id]))
         return submission_id
     
     def get_pending_photo_submissions(self) -> Dict[str, Dict]:
@@ -690,9 +1269,10 @@ class GameState:
         Returns:
             Dictionary of pending submissions
         """
-        return {k: v for k, v in self.pending_photo_submissions.items() 
-                if v.get('status') == 'pending'}
+        return {submission_id: self.pending_photo_submissions[submission_id]
+                for submission_id in self._pending_submission_ids}
     
+    @_batch_journal
     def approve_photo_submission(self, submission_id: str, total_challenges: int, photos_required: int = 1,
                                 next_challenge_requires_photo_verification: bool = None) -> bool:
         """Approve a photo submission and optionally complete the challenge.
@@ -716,15 +1296,20 @@ class GameState:
         
         # Mark submission as approved first
         self.pending_photo_submissions[submission_id]['status'] = 'approved'
+        self._pending_submission_ids.pop(submission_id, None)
+        self._journal(('set', ['pending_photo_submissions', submission_id, 'status'], 'approved'))
         
-        # Increment the photo submission count
-        self.increment_photo_submission_count(team_name, challenge_id)
-        
-        # Get the current count
-        current_count = self.get_photo_submission_count(team_name, challenge_id)
+        # Increment the photo submission count (a removed team has nothing to count)
+        team_data = self.teams.get(team_name)
+        current_count = 0
+        if team_data is not None:
+            current_count = self._increment_photo_submission_count(team_name, team_data, challenge_id)
         
         # Only complete the challenge if required number of photos is reached
         if current_count >= photos_required:
+            if team_data is None:
+                return False
+            
             # Complete the challenge
             submission_data = {
                 'type': 'photo',
@@ -737,15 +1322,10 @@ class GameState:
                 'photo_count': current_count
             }
             
-            if self.complete_challenge(team_name, challenge_id, total_challenges, submission_data,
-                                      next_challenge_requires_photo_verification):
-                self.save_state()
-                return True
-            
-            return False
+            return self._complete_challenge(team_name, team_data, challenge_id, total_challenges,
+                                            submission_data, next_challenge_requires_photo_verification)
         else:
             # Photo approved but challenge not yet complete
-            self.save_state()
             return True
     
     def reject_photo_submission(self, submission_id: str) -> bool:
@@ -762,7 +1342,8 @@ class GameState:
         
         # Mark submission as rejected
         self.pending_photo_submissions[submission_id]['status'] = 'rejected'
-        self.save_state()
+        self._pending_submission_ids.pop(submission_id, None)
+        self._journal(('set', ['pending_photo_submissions', submission_id, 'status'], 'rejected'))
         return True
     
     def get_submission_by_id(self, submission_id: str) -> Optional[Dict]:
@@ -786,12 +1367,11 @@ class GameState:
         Returns:
             Dictionary mapping checklist items to completion status
         """
-        if team_name not in self.teams:
+        team_data = self.teams.get(team_name)
+        if team_data is None:
             return {}
         
-        team_data = self.teams[team_name]
-        checklist_progress = team_data.get('checklist_progress', {})
-        return checklist_progress.get(str(challenge_id), {})
+        return team_data.get('checklist_progress', {}).get(_cid(challenge_id), {})
     
     def update_checklist_item(self, team_name: str, challenge_id: int, item: str, completed: bool = True) -> bool:
         """Update completion status of a checklist item.
@@ -805,22 +1385,21 @@ class GameState:
         Returns:
             True if successful, False otherwise
         """
-        if team_name not in self.teams:
+        team_data = self.teams.get(team_name)
+        if team_data is None:
             return False
         
-        team_data = self.teams[team_name]
-        
-        # Initialize checklist_progress if it doesn't exist
-        if 'checklist_progress' not in team_data:
-            team_data['checklist_progress'] = {}
-        
-        challenge_key = str(challenge_id)
-        if challenge_key not in team_data['checklist_progress']:
-            team_data['checklist_progress'][challenge_key] = {}
-        
-        # Update the item status
-        team_data['checklist_progress'][challenge_key][item] = completed
-        self.save_state()
+        # Update the item status, initializing checklist_progress if it doesn't exist
+        challenge_key = _cid(challenge_id)
+        progress = team_data.setdefault('checklist_progress', {}).setdefault(challenge_key, {})
+        if item in progress and progress[item] == completed:
+            return True  # Already recorded (e.g. a repeated answer) - nothing to journal
+        was_completed = bool(progress.get(item, False))
+        progress[item] = completed
+        if bool(completed) != was_completed:
+            team_counts = self._checklist_counts.setdefault(team_name, {})
+            team_counts[challenge_key] = team_counts.get(challenge_key, 0) + (1 if completed else -1)
+        self._journal(('set', ['teams', team_name, 'checklist_progress', challenge_key, item], completed))
         return True
     
     def is_checklist_complete(self, team_name: str, challenge_id: int, checklist_items: List[str]) -> bool:
@@ -834,10 +1413,16 @@ class GameState:
         Returns:
             True if all items are completed, False otherwise
         """
-        if team_name not in self.teams:
+        team_data = self.teams.get(team_name)
+        if team_data is None:
+            return False
+        
+        # Fewer items marked done than required means the checklist can't be complete
+        challenge_key = _cid(challenge_id)
+        if self._checklist_counts.get(team_name, {}).get(challenge_key, 0) < len(checklist_items):
             return False
         
-        progress = self.get_checklist_progress(team_name, challenge_id)
+        progress = team_data.get('checklist_progress', {}).get(challenge_key, {})
         
         # Check if all items are marked as completed
         for item in checklist_items:
@@ -856,12 +1441,11 @@ class GameState:
         Returns:
             Number of approved photos submitted for this challenge
         """
-        if team_name not in self.teams:
+        team_data = self.teams.get(team_name)
+        if team_data is None:
             return 0
         
-        team_data = self.teams[team_name]
-        photo_counts = team_data.get('photo_submission_counts', {})
-        return photo_counts.get(str(challenge_id), 0)
+        return team_data.get('photo_submission_counts', {}).get(_cid(challenge_id), 0)
     
     def increment_photo_submission_count(self, team_name: str, challenge_id: int) -> bool:
         """Increment the photo submission count for a team's challenge.
@@ -873,22 +1457,24 @@ class GameState:
         Returns:
             True if successful, False otherwise
         """
-        if team_name not in self.teams:
+        team_data = self.teams.get(team_name)
+        if team_data is None:
             return False
-        
-        team_data = self.teams[team_name]
-        
-        # Initialize photo_submission_counts if it doesn't exist
-        if 'photo_submission_counts' not in team_data:
-            team_data['photo_submission_counts'] = {}
-        
-        challenge_key = str(challenge_id)
-        current_count = team_data['photo_submission_counts'].get(challenge_key, 0)
-        team_data['photo_submission_counts'][challenge_key] = current_count + 1
-        
-        self.save_state()
+        self._increment_photo_submission_count(team_name, team_data, challenge_id)
         return True
     
+    def _increment_photo_submission_count(self, team_name: str, team_data: Dict, challenge_id: int) -> int:
+        """Increment a looked-up team's photo count for a challenge and return the new count."""
+        # Initialize photo_submission_counts if it doesn't exist
+        counts = team_data.setdefault('photo_submission_counts', {})
+        challenge_key = _cid(challenge_id)
+        current_count = counts.get(challenge_key, 0) + 1
+        counts[challenge_key] = current_count
+        
+        self._journal(('set', ['teams', team_name, 'photo_submission_counts', challenge_key],
+                       current_count))
+        return current_count
+    
     def create_tournament(self, challenge_id: int, team_names: List[str], game_name: str = "Tournament") -> bool:
         """Create a new tournament for a challenge.
         
@@ -900,19 +1486,17 @@ class GameState:
         Returns:
             True if tournament was created, False if already exists
         """
-        import random
-        
-        if str(challenge_id) in self.tournaments:
+        if challenge_id in self.tournaments:
             return False
         
         # Shuffle teams for random bracket
         shuffled_teams = team_names.copy()
-        random.shuffle(shuffled_teams)
+        _RNG.shuffle(shuffled_teams)
         
         # Create initial bracket
         bracket = self._generate_bracket(shuffled_teams)
         
-        self.tournaments[str(challenge_id)] = {
+        tournament = self.tournaments[challenge_id] = {
             'challenge_id': challenge_id,
             'game_name': game_name,
             'teams': team_names,
@@ -925,13 +1509,14 @@ class GameState:
         
         # Check if tournament should auto-complete (single team or all byes in first round)
         if len(bracket) > 0:
-            first_round = bracket[0]
-            all_complete = all(m['status'] in ['complete', 'bye'] for m in first_round)
-            if all_complete:
+            # Every first-round pair is pending; only an odd team out gets a bye
+            pending = len(shuffled_teams) // 2
+            if pending == 0:
                 # Auto-advance if all first round matches are already complete/bye
-                self._advance_round(challenge_id)
+                pending = self._advance_round(tournament)
+            self._round_pending[challenge_id] = pending
         
-        self.save_state()
+        self._journal(('set', ['tournaments', _cid(challenge_id)], tournament))
         return True
     
     def _generate_bracket(self, teams: List[str]) -> List[List[Dict]]:
@@ -948,28 +1533,15 @@ class GameState:
         
         # Round 1: Create initial matchups
         matches = []
-        teams_copy = teams.copy()
         
         # If odd number, last team gets a bye
-        if len(teams_copy) % 2 == 1:
-            bye_team = teams_copy.pop()
-            matches.append({
-                'team1': bye_team,
-                'team2': None,  # Bye
-                'winner': bye_team,
-                'status': 'bye'
-            })
-        
-        # Create matches for remaining teams
-        while len(teams_copy) >= 2:
-            team1 = teams_copy.pop(0)
-            team2 = teams_copy.pop(0)
-            matches.append({
-                'team1': team1,
-                'team2': team2,
-                'winner': None,
-                'status': 'pending'
-            })
+        if len(teams) % 2 == 1:
+            matches.append(_new_match(teams[-1], None))
+        
+        # Pair the remaining teams in order; zip over one iterator leaves the bye team out
+        pairs = iter(teams)
+        for team1, team2 in zip(pairs, pairs):
+            matches.append(_new_match(team1, team2))
         
         return [matches]  # First round
     
@@ -982,7 +1554,7 @@ class GameState:
         Returns:
             Tournament data or None if not found
         """
-        return self.tournaments.get(str(challenge_id))
+        return self.tournaments.get(challenge_id)
     
     def get_current_round_matches(self, challenge_id: int) -> List[Dict]:
         """Get matches for the current round of a tournament.
@@ -1015,7 +1587,7 @@ class GameState:
         Returns:
             True if winner was recorded, False otherwise
         """
-        tournament = self.get_tournament(challenge_id)
+        tournament = self.tournaments.get(challenge_id)
         if not tournament:
             return False
         
@@ -1030,9 +1602,9 @@ class GameState:
         match_found = False
         
         for match in matches:
-            if match['status'] == 'pending' and (match['team1'] == winner_team or match['team2'] == winner_team):
+            if match['status'] == MATCH_PENDING and (match['team1'] == winner_team or match['team2'] == winner_team):
                 match['winner'] = winner_team
-                match['status'] = 'complete'
+                match['status'] = MATCH_COMPLETE
                 match_found = True
                 break
         
@@ -1040,75 +1612,75 @@ class GameState:
             return False
         
         # Check if all matches in current round are complete
-        all_complete = all(m['status'] in ['complete', 'bye'] for m in matches)
+        pending = self._round_pending.get(challenge_id)
+        pending = _count_pending(matches) if pending is None else pending - 1
         
-        if all_complete:
+        if pending == 0:
             # Advance to next round or finish tournament
-            self._advance_round(challenge_id)
+            pending = self._advance_round(tournament)
+        self._round_pending[challenge_id] = pending
         
-        self.save_state()
+        self._journal(('set', ['tournaments', _cid(challenge_id)], tournament))
         return True
     
-    def _advance_round(self, challenge_id: int) -> None:
+    def _advance_round(self, tournament: Dict) -> int:
         """Advance tournament to next round or complete it.
         
+        Callers journal the tournament once after this returns.
+        
         Args:
-            challenge_id: ID of the challenge
+            tournament: The tournament data, as already looked up by the caller
+            
+        Returns:
+            Number of pending matches in the new current round (0 once complete)
         """
-        tournament = self.tournaments[str(challenge_id)]
         current_round = tournament['current_round']
         bracket = tournament['bracket']
         
-        # Get winners from current round
-        current_matches = bracket[current_round]
-        winners = [m['winner'] for m in current_matches if m['winner']]
+        # Get winners and losers from current round in one pass
+        winners = []
         losers = []
         
-        for match in current_matches:
-            if match['status'] == 'complete':
-                if match['team1'] != match['winner']:
+        for match in bracket[current_round]:
+            winner = match['winner']
+            if not winner:
+                continue
+            winners.append(winner)
+            if match['status'] == MATCH_COMPLETE:
+                if match['team1'] != winner:
                     losers.append(match['team1'])
-                if match['team2'] and match['team2'] != match['winner']:
+                if match['team2'] and match['team2'] != winner:
                     losers.append(match['team2'])
         
+        rankings = tournament['rankings']
+        ranked = set(rankings)
+        
         # If only one winner, tournament is complete
         if len(winners) == 1:
             # Add final winner to rankings
-            tournament['rankings'].insert(0, winners[0])
+            rankings.insert(0, winners[0])
+            ranked.add(winners[0])
             
             # Add remaining teams in reverse order (losers of final rounds)
             for loser in losers:
-                if loser not in tournament['rankings']:
-                    tournament['rankings'].append(loser)
+                if loser not in ranked:
+                    ranked.add(loser)
+                    rankings.append(loser)
             
             tournament['status'] = 'complete'
-            self.save_state()
-            return
+            return 0
         
         # Create next round with winners
         next_matches = []
-        winners_copy = winners.copy()
+        pairs = iter(winners)
         
         # Handle odd number of winners (give bye to first team)
-        if len(winners_copy) % 2 == 1:
-            bye_team = winners_copy.pop(0)
-            next_matches.append({
-                'team1': bye_team,
-                'team2': None,
-                'winner': bye_team,
-                'status': 'bye'
-            })
+        if len(winners) % 2 == 1:
+            next_matches.append(_new_match(next(pairs), None))
         
         # Create matches
-        while len(winners_copy) >= 2:
-            team1 = winners_copy.pop(0)
-            team2 = winners_copy.pop(0)
-            next_matches.append({
-                'team1': team1,
-                'team2': team2,
-                'winner': None,
-                'status': 'pending'
-            })
+        for team1, team2 in zip(pairs, pairs):
+            next_matches.append(_new_match(team1, team2))
         
         # Add next round to bracket
         bracket.append(next_matches)
@@ -1117,12 +1689,13 @@ class GameState:
         if len(losers) > 1:
             # Store losers for ranking later
             for loser in losers:
-                if loser not in tournament['rankings']:
-                    tournament['rankings'].append(loser)
+                if loser not in ranked:
+                    ranked.add(loser)
+                    rankings.append(loser)
         
         # Move to next round
         tournament['current_round'] += 1
-        self.save_state()
+        return _count_pending(next_matches)
     
     def is_tournament_complete(self, challenge_id: int) -> bool:
         """Check if tournament is complete.
@@ -1133,11 +1706,8 @@ class GameState:
         Returns:
             True if tournament is complete, False otherwise
         """
-        tournament = self.get_tournament(challenge_id)
-        if not tournament:
-            return False
-        
-        return tournament.get('status') == 'complete'
+        tournament = self.tournaments.get(challenge_id)
+        return tournament is not None and tournament.get('status') == 'complete'
     
     def get_tournament_last_place(self, challenge_id: int) -> Optional[str]:
         """Get the last place team from a completed tournament.
@@ -1148,15 +1718,12 @@ class GameState:
         Returns:
             Team name or None if tournament not complete
         """
-        tournament = self.get_tournament(challenge_id)
-        if not tournament or tournament.get('status') != 'complete':
+        tournament = self.tournaments.get(challenge_id)
+        if tournament is None or tournament.get('status') != 'complete':
             return None
         
-        rankings = tournament.get('rankings', [])
-        if rankings:
-            return rankings[-1]  # Last in rankings is last place
-        
-        return None
+        rankings = tournament.get('rankings')
+        return rankings[-1] if rankings else None  # Last in rankings is last place
     
     def reset_tournament(self, challenge_id: int) -> bool:
         """Reset a tournament.
@@ -1167,12 +1734,18 @@ class GameState:
         Returns:
             True if tournament was reset, False if not found
         """
-        challenge_key = str(challenge_id)
-        if challenge_key not in self.tournaments:
+        if challenge_id not in self.tournaments:
             return False
         
-        del self.tournaments[challenge_key]
-        self.save_state()
+        del self.tournaments[challenge_id]
+        self._round_pending.pop(challenge_id, None)
+        self._journal(('del', ['tournaments', _cid(challenge_id)]))
         return True
 
 
+if __name__ == "__main__":
+    import sys
+    
+    # Print the current state (snapshot plus journal) indented, for inspection
+    state = GameState(sys.argv[1] if len(sys.argv) > 1 else "game_state.json")
+    sys.stdout.write(state.dump_state(pretty=True).decode() + "\n")
@@ -10,6 +10,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestAnswerFormatValidation(unittest.IsolatedAsyncioTestCase):
@@ -66,8 +67,9 @@ class TestAnswerFormatValidation(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_photo_sent_when_text_expected(self):
         """Test that sending a photo when text is expected shows an error message."""
@@ -7,6 +7,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestAutomaticTextSubmission(unittest.IsolatedAsyncioTestCase):
@@ -56,8 +57,9 @@ class TestAutomaticTextSubmission(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_text_message_as_submission_during_active_game(self):
         """Test that a text message is treated as a submission during active game."""
@@ -292,8 +294,9 @@ class TestAutomaticPhotoSubmission(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_photo_as_submission_during_active_game(self):
         """Test that a photo is treated as a submission during active game."""
@@ -429,8 +432,9 @@ class TestInteractionWithWaitingForInput(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_waiting_for_submit_takes_precedence(self):
         """Test that waiting_for state takes precedence over automatic submission."""
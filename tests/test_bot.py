@@ -1,151 +1,139 @@
 """
 Unit tests for the bot implementation, specifically the contact command and admin configuration.
 """
+import asyncio
 import unittest
 import os
+import copy
+import tempfile
 import yaml
+from operator import itemgetter
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch, call
 from bot import AmazingRaceBot
+from game_state import GameState
+
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+
+def _remove_files(*paths):
+    """Remove test files, ignoring any that were never created."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# Files written by the bot's default GameState
+STATE_FILES = ("game_state.json", "game_state.log", "game_state.audit.log")
+
+# Config without an admin shared by every test; tests must not modify it
+BASE_CONFIG = {
+    'telegram': {'bot_token': 'test_token'},
+    'game': {
+        'name': 'Test Game',
+        'max_teams': 10,
+        'max_team_size': 5,
+        'challenges': [
+            {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
+        ]
+    }
+}
+
+# Members of the two teams created by the broadcast tests
+TEAM_MEMBER_IDS = frozenset({111111, 222222, 333333, 444444})
+
+
+class MemoryGameState(GameState):
+    """GameState that keeps everything in memory, for tests that never reload state."""
+    
+    def load_state(self):
+        pass
+    
+    def _journal(self, *ops):
+        pass
+    
+    def save_state(self):
+        pass
+    
+    def _append_audit(self, entry):
+        pass
 
 
 class TestBotAdminConfiguration(unittest.TestCase):
     """Test cases for admin configuration."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Sweep up any state files once the class is done."""
+        cls.addClassCleanup(_remove_files, *STATE_FILES)
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.test_config_file = "test_bot_config.yml"
+        fd, self.test_config_file = tempfile.mkstemp(suffix='.yml')
+        os.close(fd)
         
     def tearDown(self):
         """Clean up test files."""
-        if os.path.exists(self.test_config_file):
-            os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        _remove_files(self.test_config_file)
     
-    def test_admin_single_id_new_format(self):
-        """Test that single admin ID in new format is correctly loaded."""
-        config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
-                ]
-            },
-            'admin': 123456789
-        }
-        
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        self.assertEqual(bot.admin_id, 123456789)
-        self.assertTrue(bot.is_admin(123456789))
-        self.assertFalse(bot.is_admin(987654321))
+    def test_admin_formats(self):
+        """Test that each supported admin format resolves to the expected admin."""
+        cases = [
+            # (label, admin config, expected admin_id, recognized IDs, unrecognized IDs)
+            ("single ID (new format)", {'admin': 123456789}, 123456789, [123456789], [987654321]),
+            # Legacy list format: only the first admin is used
+            ("list (legacy format)", {'admins': [123456789, 987654321]}, 123456789, [123456789], [987654321]),
+            ("empty list (legacy format)", {'admins': []}, None, [], [123456789]),
+            ("not configured", {}, None, [], [123456789]),
+        ]
+        
+        for label, admin_config, expected_admin_id, recognized, unrecognized in cases:
+            with self.subTest(label=label):
+                bot = AmazingRaceBot(config={**BASE_CONFIG, **admin_config})
+                self.assertEqual(bot.admin_id, expected_admin_id)
+                for user_id in recognized:
+                    self.assertTrue(bot.is_admin(user_id))
+                for user_id in unrecognized:
+                    self.assertFalse(bot.is_admin(user_id))
     
-    def test_admin_list_legacy_format(self):
-        """Test that list of admins in legacy format uses first admin only."""
-        config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
-                ]
-            },
-            'admins': [123456789, 987654321]  # Legacy format
-        }
-        
+    def test_admin_loaded_from_config_file(self):
+        """Test that the admin is read from a YAML config file."""
         with open(self.test_config_file, 'w') as f:
-            yaml.dump(config, f)
+            yaml.dump({**BASE_CONFIG, 'admin': 123456789}, f, Dumper=_Dumper)
         
         bot = AmazingRaceBot(self.test_config_file)
-        # Should only use the first admin
         self.assertEqual(bot.admin_id, 123456789)
         self.assertTrue(bot.is_admin(123456789))
-        # Second admin should not be recognized
-        self.assertFalse(bot.is_admin(987654321))
     
-    def test_admin_empty_list_legacy_format(self):
-        """Test that empty admin list results in None admin_id."""
-        config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
-                ]
-            },
-            'admins': []
-        }
+    def test_config_dict_skips_config_file(self):
+        """Test that an already-loaded config is used without reading the config file."""
+        config = {**BASE_CONFIG, 'admin': 123456789}
         
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        self.assertIsNone(bot.admin_id)
-        self.assertFalse(bot.is_admin(123456789))
-    
-    def test_admin_not_configured(self):
-        """Test that missing admin configuration results in None admin_id."""
-        config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
-                ]
-            }
-        }
-        
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        self.assertIsNone(bot.admin_id)
-        self.assertFalse(bot.is_admin(123456789))
+        bot = AmazingRaceBot("missing_config.yml", config=config)
+        self.assertIs(bot.config, config)
+        self.assertEqual(bot.admin_id, 123456789)
 
 
 class TestBotContactCommand(unittest.IsolatedAsyncioTestCase):
     """Test cases for the contact command."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_config_file = "test_bot_config.yml"
-        self.config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
-                ]
-            },
-            'admin': 123456789
-        }
-        
-    def tearDown(self):
-        """Clean up test files."""
-        if os.path.exists(self.test_config_file):
-            os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+    @classmethod
+    def setUpClass(cls):
+        """Build the config shared by every test in the class."""
+        cls.config = {**BASE_CONFIG, 'admin': 123456789}
+        # The contact command only reads the admin setting, so one bot per setting is enough
+        cls.bot = AmazingRaceBot(config=cls.config)
+        cls.bot_no_admin = AmazingRaceBot(config=BASE_CONFIG)
+        cls.addClassCleanup(_remove_files, *STATE_FILES)
     
     async def test_contact_command_with_admin_configured(self):
         """Test contact command when admin is configured."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
+        bot = self.bot
         
         # Mock the update and context
         update = MagicMock()
@@ -155,9 +143,9 @@ class TestBotContactCommand(unittest.IsolatedAsyncioTestCase):
         
         await bot.contact_command(update, context)
         
-        # Verify reply_text was called
-        update.message.reply_text.assert_called_once()
-        call_args = update.message.reply_text.call_args
+        # Verify reply_text was awaited
+        update.message.reply_text.assert_awaited_once()
+        call_args = update.message.reply_text.await_args
         
         # Verify the message contains the admin link
         message = call_args[0][0]
@@ -170,13 +158,7 @@ class TestBotContactCommand(unittest.IsolatedAsyncioTestCase):
     
     async def test_contact_command_without_admin_configured(self):
         """Test contact command when admin is not configured."""
-        config_no_admin = self.config.copy()
-        del config_no_admin['admin']
-        
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(config_no_admin, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
+        bot = self.bot_no_admin
         
         # Mock the update and context
         update = MagicMock()
@@ -186,375 +168,188 @@ class TestBotContactCommand(unittest.IsolatedAsyncioTestCase):
         
         await bot.contact_command(update, context)
         
-        # Verify reply_text was called with error message
-        update.message.reply_text.assert_called_once()
-        call_args = update.message.reply_text.call_args
+        # Verify reply_text was awaited with error message
+        update.message.reply_text.assert_awaited_once()
+        call_args = update.message.reply_text.await_args
         message = call_args[0][0]
         
         self.assertIn("No admin is configured", message)
 
 
-class TestStartGameBroadcast(unittest.IsolatedAsyncioTestCase):
-    """Test cases for the start game broadcast functionality."""
+class TestBroadcastToTeams(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the team broadcast loop, without building a bot."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_config_file = "test_bot_config.yml"
-        self.config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
-                ]
-            },
-            'admin': 123456789
-        }
-        
-    def tearDown(self):
-        """Clean up test files."""
-        if os.path.exists(self.test_config_file):
-            os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+    TEAMS = {
+        "Team A": {'members': [{'id': 111111}, {'id': 222222}]},
+        "Team B": {'members': [{'id': 333333}, {'id': 444444}, {'id': 111111}]},
+    }
     
-    async def test_start_game_broadcasts_to_all_team_members(self):
-        """Test that /startgame sends message to all team members."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Create teams with members
-        bot.game_state.create_team("Team A", 111111, "Alice")
-        bot.game_state.join_team("Team A", 222222, "Bob")
-        bot.game_state.create_team("Team B", 333333, "Charlie")
-        bot.game_state.join_team("Team B", 444444, "David")
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
-        context.bot.send_message = AsyncMock()
-        
-        # Call start_game_command
-        await bot.start_game_command(update, context)
+    async def test_no_teams(self):
+        """Test that nothing is sent when there are no teams."""
+        bot = SimpleNamespace(send_message=AsyncMock())
         
-        # Verify admin got the message
-        update.message.reply_text.assert_called_once()
-        call_args = update.message.reply_text.call_args
-        message = call_args[0][0]
-        self.assertIn("THE GAME HAS STARTED!", message)
-        
-        # Verify that send_message was called for each team member
-        # Should be called 8 times: 4 for game start message + 4 for current challenge broadcast
-        # (for all team members except admin)
-        self.assertEqual(context.bot.send_message.call_count, 8)
-        
-        # Get all user IDs that received messages
-        sent_user_ids = set()
-        for call in context.bot.send_message.call_args_list:
-            sent_user_ids.add(call[1]['chat_id'])
+        sent = await AmazingRaceBot._broadcast_to_teams(bot, {}, "Hello")
         
-        # Verify all team members received messages
-        expected_user_ids = {111111, 222222, 333333, 444444}
-        self.assertEqual(sent_user_ids, expected_user_ids)
-        
-        # Verify the message content - should include both game start and challenge messages
-        game_start_messages = [call for call in context.bot.send_message.call_args_list 
-                               if "THE GAME HAS STARTED!" in call[1]['text']]
-        challenge_messages = [call for call in context.bot.send_message.call_args_list 
-                             if "New Challenge Available" in call[1]['text']]
-        
-        # Each user should get one of each message type
-        self.assertEqual(len(game_start_messages), 4)
-        self.assertEqual(len(challenge_messages), 4)
+        self.assertEqual(sent, set())
+        bot.send_message.assert_not_awaited()
     
-    async def test_start_game_no_duplicate_to_admin_in_team(self):
-        """Test that admin doesn't get duplicate message if they're in a team."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Create team with admin as member
-        bot.game_state.create_team("Team Admin", 123456789, "Admin")
-        bot.game_state.join_team("Team Admin", 222222, "Bob")
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
-        context.bot.send_message = AsyncMock()
-        
-        # Call start_game_command
-        await bot.start_game_command(update, context)
+    async def test_sends_once_per_member_and_skips_excluded(self):
+        """Test that each member gets the message once and the excluded user is skipped."""
+        bot = SimpleNamespace(send_message=AsyncMock())
         
-        # Verify admin got the message via reply_text
-        update.message.reply_text.assert_called_once()
+        sent = await AmazingRaceBot._broadcast_to_teams(bot, self.TEAMS, "Hello", exclude_user_id=444444)
         
-        # Verify send_message was called for Bob (game start + challenge broadcast)
-        # AND for admin (game start + challenge broadcast since admin is a player)
-        # Total: 4 calls (2 for Bob, 2 for Admin)
-        self.assertEqual(context.bot.send_message.call_count, 4)
-        
-        # Get all user IDs that received messages
-        sent_user_ids = set()
-        for call in context.bot.send_message.call_args_list:
-            sent_user_ids.add(call[1]['chat_id'])
-        
-        # Both admin and Bob should receive messages
-        expected_user_ids = {123456789, 222222}
-        self.assertEqual(sent_user_ids, expected_user_ids)
+        self.assertEqual(sent, {111111, 222222, 333333})
+        self.assertEqual(bot.send_message.await_args_list, [
+            call(chat_id=user_id, text="Hello", parse_mode='Markdown') for user_id in (111111, 222222, 333333)
+        ])
     
-    async def test_start_game_no_teams(self):
-        """Test /startgame when there are no teams."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
-        context.bot.send_message = AsyncMock()
+    async def test_failed_send_not_counted(self):
+        """Test that a failed send is skipped without stopping the broadcast."""
+        async def send_message_side_effect(**kwargs):
+            if kwargs['chat_id'] == 111111:
+                raise Exception("Failed to send")
         
-        # Call start_game_command
-        await bot.start_game_command(update, context)
+        bot = SimpleNamespace(send_message=AsyncMock(side_effect=send_message_side_effect))
         
-        # Verify admin got the message
-        update.message.reply_text.assert_called_once()
+        sent = await AmazingRaceBot._broadcast_to_teams(bot, self.TEAMS, "Hello")
         
-        # Verify no broadcast messages were sent (no teams)
-        context.bot.send_message.assert_not_called()
+        # 111111 is in both teams but only tried once
+        self.assertEqual(sent, {222222, 333333, 444444})
+        self.assertEqual(bot.send_message.await_count, 4)
     
-    async def test_start_game_handles_send_failure(self):
-        """Test that /startgame continues even if sending to one user fails."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Create teams
-        bot.game_state.create_team("Team A", 111111, "Alice")
-        bot.game_state.join_team("Team A", 222222, "Bob")
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
+    async def test_concurrent_sends_bounded(self):
+        """Test that no more than BROADCAST_CONCURRENCY sends are in flight at once."""
+        in_flight = 0
+        max_in_flight = 0
         
-        # Make send_message fail for first user but succeed for second
         async def send_message_side_effect(**kwargs):
-            if kwargs['chat_id'] == 111111:
-                raise Exception("Failed to send")
-            # Otherwise succeed silently
-        
-        context.bot.send_message = AsyncMock(side_effect=send_message_side_effect)
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
         
-        # Call start_game_command - should not raise exception
-        await bot.start_game_command(update, context)
+        bot = SimpleNamespace(send_message=AsyncMock(side_effect=send_message_side_effect))
+        teams = {f"Team {i}": {'members': [{'id': i * 10 + j} for j in range(4)]} for i in range(5)}
         
-        # Verify admin still got the message
-        update.message.reply_text.assert_called_once()
+        with patch.object(AmazingRaceBot, 'BROADCAST_CONCURRENCY', 3):
+            sent = await AmazingRaceBot._broadcast_to_teams(bot, teams, "Hello")
         
-        # Verify send_message was called for both users (even though one failed)
-        # Now we send game start + challenge broadcast, so 4 total attempts
-        self.assertEqual(context.bot.send_message.call_count, 4)
+        self.assertEqual(len(sent), 20)
+        self.assertEqual(max_in_flight, 3)
 
 
-class TestEndGameBroadcast(unittest.IsolatedAsyncioTestCase):
-    """Test cases for the end game broadcast functionality."""
+class TestGameBroadcast(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the /startgame and /endgame broadcast functionality."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_config_file = "test_bot_config.yml"
-        self.config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {'id': 1, 'name': 'Test', 'description': 'Test', 'location': 'Test'}
-                ]
-            },
-            'admin': 123456789
-        }
-        
-    def tearDown(self):
-        """Clean up test files."""
-        if os.path.exists(self.test_config_file):
-            os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+    # (command method, banner in the broadcast, whether the first challenge is announced too)
+    BROADCASTS = (
+        ('start_game_command', "THE GAME HAS STARTED!", True),
+        ('end_game_command', "GAME OVER!", False),
+    )
     
-    async def test_end_game_broadcasts_to_all_team_members(self):
-        """Test that /endgame sends message to all team members."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Start the game first
-        bot.game_state.start_game()
-        
-        # Create teams with members
-        bot.game_state.create_team("Team A", 111111, "Alice")
-        bot.game_state.join_team("Team A", 222222, "Bob")
-        bot.game_state.create_team("Team B", 333333, "Charlie")
-        bot.game_state.join_team("Team B", 444444, "David")
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
-        context.bot.send_message = AsyncMock()
-        
-        # Call end_game_command
-        await bot.end_game_command(update, context)
-        
-        # Verify admin got the message
-        update.message.reply_text.assert_called_once()
-        call_args = update.message.reply_text.call_args
-        message = call_args[0][0]
-        self.assertIn("GAME OVER!", message)
-        
-        # Verify that send_message was called for each team member
-        # Should be called 4 times (for all team members except admin)
-        self.assertEqual(context.bot.send_message.call_count, 4)
-        
-        # Get all user IDs that received messages
-        sent_user_ids = set()
-        for call in context.bot.send_message.call_args_list:
-            sent_user_ids.add(call[1]['chat_id'])
-        
-        # Verify all team members received the message
-        expected_user_ids = {111111, 222222, 333333, 444444}
-        self.assertEqual(sent_user_ids, expected_user_ids)
-        
-        # Verify the message content
-        for call in context.bot.send_message.call_args_list:
-            self.assertIn("GAME OVER!", call[1]['text'])
-            self.assertEqual(call[1]['parse_mode'], 'Markdown')
+    @classmethod
+    def setUpClass(cls):
+        """Build the config and bot shared by every test in the class."""
+        cls.config = {**BASE_CONFIG, 'admin': 123456789}
+        # Shared per-class update shape; tests copy it and attach a fresh message mock
+        cls._update_skeleton = SimpleNamespace(effective_user=SimpleNamespace(id=123456789))  # Admin
+        cls.bot = AmazingRaceBot(config=cls.config)
+        # Reused by every run and reset in between, rather than building new AsyncMocks each time
+        cls._reply_text = AsyncMock()
+        cls._send_message = AsyncMock()
+        # Scenarios run on MemoryGameState, so only the bot's initial state could touch the disk
+        cls.addClassCleanup(_remove_files, *STATE_FILES)
     
-    async def test_end_game_no_duplicate_to_admin_in_team(self):
+    async def _run_broadcast(self, command, teams, send_side_effect=None):
+        """Run a broadcast command as the admin against a fresh game with the given teams.
+        
+        Args:
+            command: Name of the bot command method to call
+            teams: Mapping of team name to a list of (user_id, user_name), captain first
+            send_side_effect: Optional side effect for context.bot.send_message
+            
+        Returns:
+            The (update, context) the command was called with
+        """
+        # These tests never reload state, so skip persisting mutations altogether
+        game_state = self.bot.game_state = MemoryGameState()
+        if command == 'end_game_command':
+            # Start the game first
+            game_state.start_game()
+        for team_name, members in teams.items():
+            (captain_id, captain_name), *others = members
+            game_state.create_team(team_name, captain_id, captain_name)
+            for user_id, user_name in others:
+                game_state.join_team(team_name, user_id, user_name)
+        
+        self._reply_text.reset_mock()
+        self._send_message.reset_mock(side_effect=True)
+        self._send_message.side_effect = send_side_effect
+        update = copy.copy(self._update_skeleton)
+        update.message = SimpleNamespace(reply_text=self._reply_text)
+        context = SimpleNamespace(bot=SimpleNamespace(send_message=self._send_message))
+        
+        await getattr(self.bot, command)(update, context)
+        
+        # Verify admin got the message via reply_text (awaited, not just called)
+        update.message.reply_text.assert_awaited_once()
+        return update, context
+    
+    async def test_broadcasts_to_all_team_members(self):
+        """Test that /startgame and /endgame send their message to all team members."""
+        teams = {
+            "Team A": [(111111, "Alice"), (222222, "Bob")],
+            "Team B": [(333333, "Charlie"), (444444, "David")],
+        }
+        for command, banner, announces_challenge in self.BROADCASTS:
+            with self.subTest(command=command):
+                update, context = await self._run_broadcast(command, teams)
+                self.assertIn(banner, update.message.reply_text.await_args[0][0])
+                
+                # Every member (none of them the admin) gets the banner, plus the
+                # current challenge when the game starts
+                sends = [c.kwargs for c in context.bot.send_message.await_args_list]
+                self.assertEqual(len(sends), 8 if announces_challenge else 4)
+                self.assertEqual(set(map(itemgetter('chat_id'), sends)), TEAM_MEMBER_IDS)
+                
+                texts = list(map(itemgetter('text'), sends))
+                self.assertEqual(sum(banner in text for text in texts), 4)
+                # A single set comparison still names any unexpected parse mode on failure
+                self.assertEqual({s['parse_mode'] for s in sends if banner in s['text']}, {'Markdown'})
+                self.assertEqual(sum("New Challenge Available" in text for text in texts),
+                                 4 if announces_challenge else 0)
+    
+    async def test_no_duplicate_to_admin_in_team(self):
         """Test that admin doesn't get duplicate message if they're in a team."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Start the game first
-        bot.game_state.start_game()
-        
-        # Create team with admin as member
-        bot.game_state.create_team("Team Admin", 123456789, "Admin")
-        bot.game_state.join_team("Team Admin", 222222, "Bob")
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
-        context.bot.send_message = AsyncMock()
-        
-        # Call end_game_command
-        await bot.end_game_command(update, context)
-        
-        # Verify admin got the message via reply_text
-        update.message.reply_text.assert_called_once()
-        
-        # Verify send_message was only called once for Bob (not for admin)
-        self.assertEqual(context.bot.send_message.call_count, 1)
-        call_args = context.bot.send_message.call_args
-        self.assertEqual(call_args[1]['chat_id'], 222222)
+        teams = {"Team Admin": [(123456789, "Admin"), (222222, "Bob")]}
+        # /startgame also sends the admin-player their challenge (game start + challenge
+        # for each of the two); /endgame only messages Bob
+        expected = {
+            'start_game_command': (4, {123456789, 222222}),
+            'end_game_command': (1, {222222}),
+        }
+        for command, _, _ in self.BROADCASTS:
+            with self.subTest(command=command):
+                _, context = await self._run_broadcast(command, teams)
+                expected_calls, expected_user_ids = expected[command]
+                sends = context.bot.send_message.await_args_list
+                self.assertEqual(len(sends), expected_calls)
+                self.assertEqual(set(map(itemgetter('chat_id'), (c.kwargs for c in sends))), expected_user_ids)
     
-    async def test_end_game_no_teams(self):
-        """Test /endgame when there are no teams."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Start the game first
-        bot.game_state.start_game()
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
-        context.bot.send_message = AsyncMock()
-        
-        # Call end_game_command
-        await bot.end_game_command(update, context)
-        
-        # Verify admin got the message
-        update.message.reply_text.assert_called_once()
-        
-        # Verify no broadcast messages were sent (no teams)
-        context.bot.send_message.assert_not_called()
+    async def test_no_teams(self):
+        """Test /startgame and /endgame when there are no teams."""
+        for command, _, _ in self.BROADCASTS:
+            with self.subTest(command=command):
+                _, context = await self._run_broadcast(command, {})
+                
+                # Verify no broadcast messages were awaited (no teams)
+                context.bot.send_message.assert_not_awaited()
     
-    async def test_end_game_handles_send_failure(self):
-        """Test that /endgame continues even if sending to one user fails."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
-        
-        # Start the game first
-        bot.game_state.start_game()
-        
-        # Create teams
-        bot.game_state.create_team("Team A", 111111, "Alice")
-        bot.game_state.join_team("Team A", 222222, "Bob")
-        
-        # Mock the update and context
-        update = MagicMock()
-        update.effective_user = MagicMock()
-        update.effective_user.id = 123456789  # Admin
-        update.message = MagicMock()
-        update.message.reply_text = AsyncMock()
-        
-        context = MagicMock()
-        context.bot = MagicMock()
+    async def test_handles_send_failure(self):
+        """Test that /startgame and /endgame continue even if sending to one user fails."""
+        teams = {"Team A": [(111111, "Alice"), (222222, "Bob")]}
         
         # Make send_message fail for first user but succeed for second
         async def send_message_side_effect(**kwargs):
@@ -562,16 +357,14 @@ class TestEndGameBroadcast(unittest.IsolatedAsyncioTestCase):
                 raise Exception("Failed to send")
             # Otherwise succeed silently
         
-        context.bot.send_message = AsyncMock(side_effect=send_message_side_effect)
-        
-        # Call end_game_command - should not raise exception
-        await bot.end_game_command(update, context)
-        
-        # Verify admin still got the message
-        update.message.reply_text.assert_called_once()
-        
-        # Verify send_message was called for both users (even though one failed)
-        self.assertEqual(context.bot.send_message.call_count, 2)
+        for command, _, announces_challenge in self.BROADCASTS:
+            with self.subTest(command=command):
+                # Should not raise even though one send fails
+                _, context = await self._run_broadcast(command, teams, send_message_side_effect)
+                
+                # Verify send_message was attempted for both users (game start also
+                # broadcasts the current challenge, doubling the attempts)
+                self.assertEqual(context.bot.send_message.await_count, 4 if announces_challenge else 2)
 
 
 if __name__ == '__main__':
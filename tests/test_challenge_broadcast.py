@@ -6,6 +6,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch, call
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestChallengeBroadcast(unittest.IsolatedAsyncioTestCase):
@@ -51,8 +52,9 @@ class TestChallengeBroadcast(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_broadcast_to_team_members_on_answer_challenge(self):
         """Test that challenge completion is broadcast to all team members for answer challenge."""
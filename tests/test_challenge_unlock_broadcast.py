@@ -7,6 +7,7 @@ import yaml
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestChallengeUnlockBroadcast(unittest.IsolatedAsyncioTestCase):
@@ -65,8 +66,9 @@ class TestChallengeUnlockBroadcast(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_broadcast_next_challenge_when_no_timeout(self):
         """Test that next challenge is broadcast when there's no timeout (no hints used)."""
@@ -3,74 +3,83 @@ Unit tests for the challenges command - testing that descriptions are not shown.
 """
 import unittest
 import os
-import yaml
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
+from game_state import GameState
+
+# Config shared by every test; tests must not modify it
+CONFIG = {
+    'telegram': {'bot_token': 'test_token'},
+    'game': {
+        'name': 'Test Game',
+        'max_teams': 10,
+        'max_team_size': 5,
+        'challenges': [
+            {
+                'id': 1,
+                'name': 'First Challenge',
+                'description': 'Complete the first task',
+                'location': 'Starting Point',
+                'type': 'photo',
+                'verification': {'method': 'photo'}
+            },
+            {
+                'id': 2,
+                'name': 'Second Challenge',
+                'description': 'Solve the riddle',
+                'location': 'Library',
+                'type': 'riddle',
+                'verification': {'method': 'answer', 'answer': 'keyboard'}
+            },
+            {
+                'id': 3,
+                'name': 'Third Challenge',
+                'description': 'Find the location',
+                'location': 'Park',
+                'type': 'location',
+                'verification': {'method': 'location'}
+            },
+            {
+                'id': 4,
+                'name': 'Fourth Challenge',
+                'description': 'Final task',
+                'location': 'Finish Line',
+                'type': 'photo',
+                'verification': {'method': 'photo'}
+            }
+        ]
+    },
+    'admin': 123456789
+}
 
 
 class TestChallengesCommand(unittest.IsolatedAsyncioTestCase):
     """Test cases for the /challenges command."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_config_file = "test_challenges_config.yml"
-        self.config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {
-                        'id': 1,
-                        'name': 'First Challenge',
-                        'description': 'Complete the first task',
-                        'location': 'Starting Point',
-                        'type': 'photo',
-                        'verification': {'method': 'photo'}
-                    },
-                    {
-                        'id': 2,
-                        'name': 'Second Challenge',
-                        'description': 'Solve the riddle',
-                        'location': 'Library',
-                        'type': 'riddle',
-                        'verification': {'method': 'answer', 'answer': 'keyboard'}
-                    },
-                    {
-                        'id': 3,
-                        'name': 'Third Challenge',
-                        'description': 'Find the location',
-                        'location': 'Park',
-                        'type': 'location',
-                        'verification': {'method': 'location'}
-                    },
-                    {
-                        'id': 4,
-                        'name': 'Fourth Challenge',
-                        'description': 'Final task',
-                        'location': 'Finish Line',
-                        'type': 'photo',
-                        'verification': {'method': 'photo'}
-                    }
-                ]
-            },
-            'admin': 123456789
-        }
-        
-    def tearDown(self):
+    @classmethod
+    def setUpClass(cls):
+        """Build the bot shared by every test in the class."""
+        cls.bot = AmazingRaceBot(config=CONFIG)
+    
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test files."""
-        if os.path.exists(self.test_config_file):
-            os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in ("game_state.json", cls.bot.game_state.journal_file):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def setUp(self):
+        """Start each test from a fresh game."""
+        # None of these tests reload state, so skip writing it to disk
+        for method in ('save_state', '_journal'):
+            patcher = patch.object(GameState, method, lambda self, *args: None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.bot.game_state.reset_game()
     
     async def test_challenges_shows_only_completed_and_current(self):
         """Test that /challenges only shows completed challenges and current challenge, not locked ones."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
+        bot = self.bot
         
         # Create a team and complete first challenge
         bot.game_state.create_team("Team A", 111111, "Alice")
@@ -122,10 +131,7 @@ class TestChallengesCommand(unittest.IsolatedAsyncioTestCase):
     
     async def test_challenges_shows_all_completed_when_finished(self):
         """Test that /challenges shows all challenges when team has finished."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
+        bot = self.bot
         
         # Create a team and complete all challenges
         bot.game_state.create_team("Team A", 111111, "Alice")
@@ -174,10 +180,7 @@ class TestChallengesCommand(unittest.IsolatedAsyncioTestCase):
     
     async def test_challenges_shows_only_first_when_no_progress(self):
         """Test that /challenges shows only the first challenge when no progress made."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
+        bot = self.bot
         
         # Create a team with no progress
         bot.game_state.create_team("Team A", 111111, "Alice")
@@ -216,10 +219,7 @@ class TestChallengesCommand(unittest.IsolatedAsyncioTestCase):
     
     async def test_challenges_user_not_in_team(self):
         """Test that /challenges shows first challenge even if user is not in a team."""
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(self.config, f)
-        
-        bot = AmazingRaceBot(self.test_config_file)
+        bot = self.bot
         
         # Mock the update and context (user not in any team)
         update = MagicMock()
@@ -12,6 +12,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestChecklistFeature(unittest.IsolatedAsyncioTestCase):
@@ -68,8 +69,9 @@ class TestChecklistFeature(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_submit_single_checklist_item(self):
         """Test submitting a single checklist item."""
@@ -4,7 +4,7 @@ Unit tests for custom timeout penalty feature.
 import unittest
 import os
 from datetime import datetime, timedelta
-from game_state import GameState
+from game_state import GameState, state_file_paths
 
 # Timing tolerance for unlock time tests (in seconds)
 TIMING_TOLERANCE_SECONDS = 1
@@ -27,8 +27,9 @@ class TestCustomTimeoutPenalty(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test files."""
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_default_penalty_without_config(self):
         """Test that default 2-minute penalty is used when no custom config provided."""
@@ -1,9 +1,11 @@
 """
 Unit tests for the game state management.
 """
+import asyncio
 import unittest
 import os
 import json
+from unittest.mock import patch
 from game_state import GameState
 
 
@@ -18,8 +20,9 @@ class TestGameState(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test files."""
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
+        for path in (self.test_state_file, self.game_state.journal_file, self.game_state.audit_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_create_team(self):
         """Test team creation."""
@@ -99,6 +102,40 @@ class TestGameState(unittest.TestCase):
         self.assertFalse(result)
         self.assertEqual(len(self.game_state.teams["Team A"]["completed_challenges"]), 1)
     
+    def test_is_challenge_completed(self):
+        """Test checking individual challenge completion for a team."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.complete_challenge("Team A", 1, 4)
+        self.assertTrue(self.game_state.is_challenge_completed("Team A", 1))
+        self.assertFalse(self.game_state.is_challenge_completed("Team A", 2))
+        self.assertFalse(self.game_state.is_challenge_completed("Team B", 1))
+        self.assertFalse(self.game_state.is_challenge_completed("Team A", -1))
+    
+    def test_completion_flags_cover_passed_challenges(self):
+        """Test that completion flags track passed and completed challenges across reloads."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.complete_challenge("Team A", 1, 70)
+        self.game_state.pass_team("Team A", 70, 999, "Admin")
+        self.game_state.complete_challenge("Team A", 3, 70)
+        
+        new_game_state = GameState(self.test_state_file)
+        for challenge_id in (1, 2, 3):
+            self.assertTrue(new_game_state.is_challenge_completed("Team A", challenge_id))
+        self.assertFalse(new_game_state.is_challenge_completed("Team A", 4))
+        self.assertEqual(new_game_state.teams["Team A"]['completed_challenges'], [1, 2, 3])
+    
+    def test_complete_challenge_twice_after_reload_and_rename(self):
+        """Test duplicate completion detection survives reloads and renames."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.complete_challenge("Team A", 1, 4)
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertFalse(new_game_state.complete_challenge("Team A", 1, 4))
+        
+        new_game_state.update_team("Team A", new_team_name="Team Alpha")
+        self.assertFalse(new_game_state.complete_challenge("Team Alpha", 1, 4))
+        self.assertTrue(new_game_state.complete_challenge("Team Alpha", 2, 4))
+    
     def test_get_team_by_user(self):
         """Test getting team by user ID."""
         self.game_state.create_team("Team A", 123, "Alice")
@@ -110,6 +147,61 @@ class TestGameState(unittest.TestCase):
         team_name = self.game_state.get_team_by_user(999)
         self.assertIsNone(team_name)
     
+    def test_get_team_by_user_tracks_membership_changes(self):
+        """Test that user lookups follow joins, removals and renames."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.add_member_to_team("Team A", 789, "Charlie", 5)
+        self.assertEqual(self.game_state.get_team_by_user(789), "Team A")
+        
+        self.game_state.remove_member_from_team("Team A", 456)
+        self.assertIsNone(self.game_state.get_team_by_user(456))
+        
+        self.game_state.update_team("Team A", new_team_name="Team Alpha")
+        self.assertEqual(self.game_state.get_team_by_user(123), "Team Alpha")
+        
+        self.game_state.remove_team("Team Alpha")
+        self.assertIsNone(self.game_state.get_team_by_user(123))
+        self.assertIsNone(self.game_state.get_team_by_user(789))
+    
+    def test_get_team_by_user_in_several_teams(self):
+        """Test that a user listed in several teams maps to the earliest one, like a scan of teams."""
+        # Admin-created teams all use captain ID 0
+        self.game_state.create_team("Team A", 0, "Admin")
+        self.game_state.create_team("Team B", 0, "Admin")
+        self.game_state.create_team("Team C", 0, "Admin")
+        self.assertEqual(self.game_state.get_team_by_user(0), "Team A")
+        self.assertEqual(GameState(self.test_state_file).get_team_by_user(0), "Team A")
+        
+        self.game_state.remove_team("Team B")
+        self.assertEqual(self.game_state.get_team_by_user(0), "Team A")
+        
+        # Renaming moves the team to the end of the team order
+        self.game_state.update_team("Team A", new_team_name="Team Alpha")
+        self.assertEqual(self.game_state.get_team_by_user(0), "Team C")
+        
+        self.game_state.remove_team("Team C")
+        self.assertEqual(self.game_state.get_team_by_user(0), "Team Alpha")
+    
+    def test_get_team_by_user_cleared_by_reset(self):
+        """Test that resetting the game clears user lookups so players can join again."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.reset_game()
+        
+        self.assertIsNone(self.game_state.get_team_by_user(456))
+        self.assertTrue(self.game_state.create_team("Team B", 456, "Bob"))
+        self.assertEqual(self.game_state.get_team_by_user(456), "Team B")
+    
+    def test_get_team_by_user_after_load(self):
+        """Test that user lookups work on a freshly loaded state."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(new_game_state.get_team_by_user(456), "Team A")
+        self.assertFalse(new_game_state.join_team("Team A", 456, "Bob"))
+    
     def test_leaderboard(self):
         """Test leaderboard generation with new sequential system."""
         self.game_state.create_team("Team A", 123, "Alice")
@@ -126,6 +218,138 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(leaderboard[1][0], "Team A")
         self.assertEqual(leaderboard[1][1], 1)
     
+    def test_leaderboard_refreshes_after_progress(self):
+        """Test that the cached leaderboard is rebuilt when progress changes."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.create_team("Team B", 456, "Bob")
+        self.game_state.complete_challenge("Team A", 1, 2)
+        self.assertEqual(self.game_state.get_leaderboard()[0], ("Team A", 1, None))
+        
+        self.game_state.complete_challenge("Team B", 1, 2)
+        self.game_state.complete_challenge("Team B", 2, 2)
+        leaderboard = self.game_state.get_leaderboard()
+        self.assertEqual(leaderboard[0][0], "Team B")
+        self.assertIsNotNone(leaderboard[0][2])
+        
+        self.game_state.remove_team("Team B")
+        self.assertEqual([row[0] for row in self.game_state.get_leaderboard()], ["Team A"])
+    
+    def test_load_state_backfills_completed_count(self):
+        """Test that teams saved without a completed count get one on load."""
+        legacy_state = {
+            'teams': {
+                'Team A': {
+                    'captain_id': 123,
+                    'captain_name': 'Alice',
+                    'members': [{'id': 123, 'name': 'Alice'}],
+                    'current_challenge_index': 2,
+                    'completed_challenges': [1, 2],
+                    'finish_time': None
+                }
+            }
+        }
+        with open(self.test_state_file, 'w') as f:
+            json.dump(legacy_state, f)
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(new_game_state.teams['Team A']['num_completed'], 2)
+        self.assertEqual(new_game_state.get_leaderboard(), [('Team A', 2, None)])
+    
+    def test_pending_photo_queues_track_reviews(self):
+        """Test that only unreviewed photos are reported as pending, including after reload."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        first = self.game_state.add_pending_photo_submission("Team A", 1, "photo_1", 123, "Alice")
+        second = self.game_state.add_pending_photo_submission("Team A", 1, "photo_2", 123, "Alice")
+        verification = self.game_state.add_pending_photo_verification("Team A", 2, "photo_3", 123, "Alice")
+        
+        self.game_state.reject_photo_submission(first)
+        self.assertEqual(list(self.game_state.get_pending_photo_submissions()), [second])
+        self.assertEqual(list(self.game_state.get_pending_photo_verifications()), [verification])
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(list(new_game_state.get_pending_photo_submissions()), [second])
+        new_game_state.approve_photo_verification(verification)
+        self.assertEqual(new_game_state.get_pending_photo_verifications(), {})
+    
+    def test_has_pending_photo_verification(self):
+        """Test checking for an unreviewed location photo per team and challenge."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        verification = self.game_state.add_pending_photo_verification("Team A", 2, "photo_1", 123, "Alice")
+        self.assertTrue(self.game_state.has_pending_photo_verification("Team A", 2))
+        self.assertFalse(self.game_state.has_pending_photo_verification("Team A", 3))
+        self.assertFalse(self.game_state.has_pending_photo_verification("Team B", 2))
+        
+        self.game_state.reject_photo_verification(verification)
+        self.assertFalse(self.game_state.has_pending_photo_verification("Team A", 2))
+    
+    def test_pending_photo_ids_unique_and_compact(self):
+        """Test that photo IDs stay unique and fit in Telegram callback data for long team names."""
+        team_name = "The Extremely Long Team Name Of Champions"
+        self.game_state.create_team(team_name, 123, "Alice")
+        ids = {self.game_state.add_pending_photo_submission(team_name, 1, f"photo_{i}", 123, "Alice")
+               for i in range(10)}
+        ids.add(self.game_state.add_pending_photo_verification(team_name, 1, "photo_v", 123, "Alice"))
+        
+        self.assertEqual(len(ids), 11)
+        for photo_id in ids:
+            self.assertLessEqual(len(f"verify_approve_{photo_id}".encode()), 64)
+    
+    def test_mark_challenge_unlock_broadcast(self):
+        """Test that unlock announcements are recorded per team and survive a reload."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.mark_challenge_unlock_broadcast("Team A", 2)
+        self.game_state.mark_challenge_unlock_broadcast("Team B", 2)
+        
+        broadcasts = GameState(self.test_state_file).teams["Team A"]['challenge_unlock_broadcasts']
+        self.assertEqual(list(broadcasts), ['2'])
+        self.assertTrue(self.game_state.has_challenge_unlock_broadcast("Team A", 2))
+        self.assertFalse(self.game_state.has_challenge_unlock_broadcast("Team A", 3))
+        self.assertFalse(self.game_state.has_challenge_unlock_broadcast("Team B", 2))
+    
+    def test_checklist_completion_tracks_unmarked_items_and_reloads(self):
+        """Test checklist completion as items are marked, unmarked, reloaded and the team renamed."""
+        items = ["Tokyo", "Paris", "Cairo"]
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.update_checklist_item("Team A", 1, "Tokyo")
+        self.game_state.update_checklist_item("Team A", 1, "Tokyo")
+        self.game_state.update_checklist_item("Team A", 1, "Paris")
+        self.assertFalse(self.game_state.is_checklist_complete("Team A", 1, items))
+        
+        self.game_state.update_checklist_item("Team A", 1, "Cairo")
+        self.assertTrue(self.game_state.is_checklist_complete("Team A", 1, items))
+        self.game_state.update_checklist_item("Team A", 1, "Paris", completed=False)
+        self.assertFalse(self.game_state.is_checklist_complete("Team A", 1, items))
+        self.game_state.update_checklist_item("Team A", 1, "Paris")
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertTrue(new_game_state.is_checklist_complete("Team A", 1, items))
+        self.assertFalse(new_game_state.is_checklist_complete("Team A", 1, items + ["Rome"]))
+        self.assertFalse(new_game_state.is_checklist_complete("Team A", 2, items))
+        
+        new_game_state.update_team("Team A", new_team_name="Team Z")
+        self.assertTrue(new_game_state.is_checklist_complete("Team Z", 1, items))
+    
+    def test_repeated_checklist_item_not_journaled(self):
+        """Test that re-marking a checklist item with the same status skips the journal write."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.assertTrue(self.game_state.update_checklist_item("Team A", 1, "Tokyo"))
+        
+        with patch('builtins.open', wraps=open) as mock_open:
+            self.assertTrue(self.game_state.update_checklist_item("Team A", 1, "Tokyo"))
+        self.assertEqual(mock_open.call_count, 0)
+        self.assertEqual(self.game_state.get_checklist_progress("Team A", 1), {"Tokyo": True})
+    
+    def test_is_challenge_photo_verified(self):
+        """Test checking whether a team's location photo was approved."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        verification_id = self.game_state.add_pending_photo_verification("Team A", 1, "photo_1", 123, "Alice")
+        self.assertFalse(self.game_state.is_challenge_photo_verified("Team A", 1))
+        
+        self.game_state.approve_photo_verification(verification_id)
+        self.assertTrue(self.game_state.is_challenge_photo_verified("Team A", 1))
+        self.assertFalse(self.game_state.is_challenge_photo_verified("Team A", 2))
+        self.assertFalse(self.game_state.is_challenge_photo_verified("Team B", 1))
+    
     def test_start_game(self):
         """Test starting the game."""
         self.assertFalse(self.game_state.game_started)
@@ -150,6 +374,218 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(new_game_state.teams["Team A"]["current_challenge_index"], 1)
         self.assertEqual(len(new_game_state.teams["Team A"]["completed_challenges"]), 1)
     
+    def test_mutations_replayed_from_journal(self):
+        """Test that mutations after the last snapshot are restored from the journal."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.use_hint("Team A", 1, 0, 123, "Alice")
+        self.game_state.set_photo_verification(False)
+        self.assertTrue(os.path.exists(self.game_state.journal_file))
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(len(new_game_state.teams["Team A"]["members"]), 2)
+        self.assertEqual(new_game_state.get_hint_count("Team A", 1), 1)
+        self.assertFalse(new_game_state.photo_verification_enabled)
+    
+    def test_progress_replayed_from_journal(self):
+        """Test that journaled challenge completions rebuild the same team record."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.complete_challenge("Team A", 1, 2, {'answer': 'yes'})
+        self.game_state.pass_team("Team A", 2, 999, "Admin")
+        self.assertTrue(os.path.exists(self.game_state.journal_file))
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(new_game_state.teams["Team A"], self.game_state.teams["Team A"])
+        self.assertEqual(new_game_state.admin_audit_log, self.game_state.admin_audit_log)
+        self.assertEqual(new_game_state.get_leaderboard(), self.game_state.get_leaderboard())
+    
+    def test_appends_after_torn_journal_tail_survive_restart(self):
+        """Test that entries journaled after a torn tail are not lost on the next restart."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.use_hint("Team A", 1, 0, 123, "Alice")
+        with open(self.game_state.journal_file, 'ab') as f:
+            f.write(b'{"op":"app')  # Write cut short by a crash
+        
+        restarted = GameState(self.test_state_file)
+        self.assertEqual(restarted.get_hint_count("Team A", 1), 1)
+        restarted.join_team("Team A", 456, "Bob")
+        restarted.use_hint("Team A", 1, 1, 456, "Bob")
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(len(new_game_state.teams["Team A"]["members"]), 2)
+        self.assertEqual(new_game_state.get_hint_count("Team A", 1), 2)
+    
+    def test_torn_journal_header_keeps_snapshot(self):
+        """Test that a journal with a torn header is ignored rather than losing the snapshot."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.save_state()
+        with open(self.game_state.journal_file, 'wb') as f:
+            f.write(b'{"genera')  # Header write cut short by a crash
+        
+        restarted = GameState(self.test_state_file)
+        self.assertIn("Team A", restarted.teams)
+        restarted.join_team("Team A", 456, "Bob")
+        restarted.save_state()
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(len(new_game_state.teams["Team A"]["members"]), 2)
+    
+    def test_photo_approval_journaled_in_one_write(self):
+        """Test that approving a photo and completing its challenge appends to the journal once."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        submission = self.game_state.add_pending_photo_submission("Team A", 1, "photo_1", 123, "Alice")
+        
+        with patch('builtins.open', wraps=open) as mock_open:
+            self.assertTrue(self.game_state.approve_photo_submission(submission, 3))
+        journal_writes = [call for call in mock_open.call_args_list
+                          if call.args[0] == self.game_state.journal_file]
+        self.assertEqual(len(journal_writes), 1)
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(new_game_state.teams["Team A"], self.game_state.teams["Team A"])
+        self.assertEqual(new_game_state.get_pending_photo_submissions(), {})
+    
+    def test_photo_verification_approval_journaled_in_one_write(self):
+        """Test that approving a location photo appends to the journal once."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.complete_challenge("Team A", 1, 3, {})
+        verification = self.game_state.add_pending_photo_verification("Team A", 2, "photo_1", 123, "Alice")
+        
+        with patch('builtins.open', wraps=open) as mock_open:
+            self.assertTrue(self.game_state.approve_photo_verification(verification))
+        journal_writes = [call for call in mock_open.call_args_list
+                          if call.args[0] == self.game_state.journal_file]
+        self.assertEqual(len(journal_writes), 1)
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(new_game_state.teams["Team A"], self.game_state.teams["Team A"])
+        self.assertTrue(new_game_state.is_challenge_photo_verified("Team A", 2))
+        self.assertEqual(new_game_state.get_pending_photo_verifications(), {})
+    
+    def test_save_state_compacts_journal(self):
+        """Test that a full snapshot truncates the journal."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.save_state()
+        self.assertFalse(os.path.exists(self.game_state.journal_file))
+        
+        with open(self.test_state_file) as f:
+            data = json.load(f)
+        self.assertEqual(len(data["teams"]["Team A"]["members"]), 2)
+    
+    def test_save_and_load_state_without_orjson(self):
+        """Test that persistence falls back to the standard json module."""
+        with patch('game_state.orjson', None):
+            self.game_state.create_team("Team A", 123, "Alice")
+            self.game_state.join_team("Team A", 456, "Bob")
+            self.game_state.save_state()
+            self.game_state.use_hint("Team A", 1, 0, 123, "Alice")
+            
+            new_game_state = GameState(self.test_state_file)
+        
+        self.assertEqual(len(new_game_state.teams["Team A"]["members"]), 2)
+        self.assertEqual(new_game_state.get_hint_count("Team A", 1), 1)
+    
+    def test_snapshot_compact_unless_pretty(self):
+        """Test that snapshots are compact by default and indented with GAMESTATE_PRETTY."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.save_state()
+        with open(self.test_state_file) as f:
+            self.assertNotIn('\n', f.read().strip())
+        
+        with patch.dict(os.environ, {'GAMESTATE_PRETTY': '1'}):
+            pretty_state = GameState(self.test_state_file)
+        pretty_state.join_team("Team A", 456, "Bob")
+        pretty_state.save_state()
+        with open(self.test_state_file) as f:
+            self.assertIn('\n  "teams"', f.read())
+        self.assertEqual(len(GameState(self.test_state_file).teams["Team A"]["members"]), 2)
+    
+    def test_dump_state_includes_journaled_changes(self):
+        """Test that dump_state reflects journaled changes without writing a snapshot."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.save_state()
+        self.game_state.join_team("Team A", 456, "Bob")
+        
+        dumped = GameState(self.test_state_file).dump_state(pretty=True)
+        self.assertIn(b'\n  "teams"', dumped)
+        self.assertEqual(len(json.loads(dumped)["teams"]["Team A"]["members"]), 2)
+        self.assertEqual(json.loads(dumped), json.loads(self.game_state.dump_state()))
+        with open(self.test_state_file) as f:
+            self.assertEqual(len(json.load(f)["teams"]["Team A"]["members"]), 1)
+    
+    def test_load_state_from_memory_map(self):
+        """Test that large snapshots are loaded through a memory map."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.save_state()
+        self.game_state.join_team("Team A", 456, "Bob")
+        
+        with patch('game_state.MMAP_LOAD_BYTES', 1):
+            new_game_state = GameState(self.test_state_file)
+        
+        self.assertEqual(len(new_game_state.teams["Team A"]["members"]), 2)
+        self.assertEqual(new_game_state._generation, self.game_state._generation)
+    
+    def test_save_state_skips_unchanged_state(self):
+        """Test that saving identical state does not replace the state file."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.save_state()
+        inode = os.stat(self.test_state_file).st_ino
+        
+        self.game_state.save_state()
+        self.assertEqual(os.stat(self.test_state_file).st_ino, inode)
+        
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.save_state()
+        self.assertNotEqual(os.stat(self.test_state_file).st_ino, inode)
+        self.assertFalse(os.path.exists(self.test_state_file + '.tmp'))
+    
+    def test_flush_compacts_journal(self):
+        """Test that flush writes pending journal entries into the snapshot."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.flush()
+        self.assertFalse(os.path.exists(self.game_state.journal_file))
+        
+        with open(self.test_state_file) as f:
+            data = json.load(f)
+        self.assertEqual(len(data["teams"]["Team A"]["members"]), 2)
+    
+    def test_start_game_flushes_journal(self):
+        """Test that starting the game compacts the journal immediately."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.start_game()
+        self.assertFalse(os.path.exists(self.game_state.journal_file))
+    
+    def test_end_game_flushes_journal(self):
+        """Test that ending the game compacts the journal immediately."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.game_state.end_game()
+        self.assertFalse(os.path.exists(self.game_state.journal_file))
+    
+    def test_compaction_deferred_on_event_loop(self):
+        """Test that journaled mutations schedule a compaction when an event loop is running."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        
+        async def mutate():
+            self.game_state.join_team("Team A", 456, "Bob")
+            self.assertIsNotNone(self.game_state._flush_handle)
+            self.game_state.flush()
+            self.assertIsNone(self.game_state._flush_handle)
+        
+        asyncio.run(mutate())
+    
+    def test_stale_journal_ignored(self):
+        """Test that a journal left behind by another snapshot is not replayed."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        os.remove(self.test_state_file)
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(len(new_game_state.teams), 0)
+        
     def test_reset_game(self):
         """Test resetting the game."""
         self.game_state.create_team("Team A", 123, "Alice")
@@ -160,6 +596,14 @@ class TestGameState(unittest.TestCase):
         self.assertFalse(self.game_state.game_started)
         self.assertFalse(self.game_state.game_ended)
     
+    def test_reset_game_when_fresh_skips_write(self):
+        """Test that resetting an already-fresh game does not rewrite the state file."""
+        if os.path.exists(self.test_state_file):
+            os.remove(self.test_state_file)
+        
+        self.game_state.reset_game()
+        self.assertFalse(os.path.exists(self.test_state_file))
+    
     def test_update_team_rename(self):
         """Test renaming a team."""
         self.game_state.create_team("Team A", 123, "Alice")
@@ -176,6 +620,25 @@ class TestGameState(unittest.TestCase):
         self.assertFalse(result)
         self.assertIn("Team A", self.game_state.teams)
     
+    def test_update_team_failed_rename_keeps_captain(self):
+        """Test that a rejected rename does not apply the captain change either."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 789, "Charlie")
+        self.game_state.create_team("Team B", 456, "Bob")
+        result = self.game_state.update_team("Team A", new_team_name="Team B",
+                                             new_captain_id=789, new_captain_name="Charlie")
+        self.assertFalse(result)
+        self.assertEqual(self.game_state.teams["Team A"]["captain_id"], 123)
+    
+    def test_update_team_captain_persists(self):
+        """Test that a captain change without a rename survives a reload."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 789, "Charlie")
+        self.assertTrue(self.game_state.update_team("Team A", new_captain_id=789, new_captain_name="Charlie"))
+        
+        team = GameState(self.test_state_file).teams["Team A"]
+        self.assertEqual((team["captain_id"], team["captain_name"]), (789, "Charlie"))
+    
     def test_remove_team(self):
         """Test removing a team."""
         self.game_state.create_team("Team A", 123, "Alice")
@@ -203,6 +666,29 @@ class TestGameState(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(len(self.game_state.teams["Team A"]["members"]), 1)
     
+    def test_remove_captain_promotes_next_member(self):
+        """Test that removing the captain promotes the next member and persists."""
+        self.game_state.create_team("Team A", 123, "Alice")
+        self.game_state.join_team("Team A", 456, "Bob")
+        self.assertTrue(self.game_state.remove_member_from_team("Team A", 123))
+        
+        reloaded = GameState(self.test_state_file)
+        team = reloaded.teams["Team A"]
+        self.assertEqual(team['members'], [{'id': 456, 'name': 'Bob'}])
+        self.assertEqual(team['captain_id'], 456)
+        self.assertEqual(team['captain_name'], "Bob")
+        self.assertIsNone(reloaded.get_team_by_user(123))
+        
+        # A captain set by update_team who is not a member is still replaced
+        self.game_state.join_team("Team A", 789, "Charlie")
+        self.game_state.update_team("Team A", new_captain_id=999, new_captain_name="Outsider")
+        self.assertTrue(self.game_state.remove_member_from_team("Team A", 999))
+        
+        team = GameState(self.test_state_file).teams["Team A"]
+        self.assertEqual(len(team['members']), 2)
+        self.assertEqual(team['captain_id'], 456)
+        self.assertEqual(team['captain_name'], "Bob")
+    
     def test_remove_last_member_fails(self):
         """Test that removing the last member (captain) fails."""
         self.game_state.create_team("Team A", 123, "Alice")
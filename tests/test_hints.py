@@ -26,6 +26,8 @@ class TestHintsFeature(unittest.TestCase):
         """Clean up test files."""
         if os.path.exists(self.test_state_file):
             os.remove(self.test_state_file)
+        if os.path.exists(self.game_state.journal_file):
+            os.remove(self.game_state.journal_file)
     
     def test_use_hint(self):
         """Test recording hint usage."""
@@ -158,6 +160,53 @@ class TestHintsFeature(unittest.TestCase):
         self.assertEqual(len(used_hints), 2)
         self.assertEqual(new_game_state.get_hint_count("Test Team", 1), 2)
     
+    def test_unlock_time_follows_updated_completion_time(self):
+        """Test that the unlock time is recomputed when the completion time changes."""
+        self.game_state.use_hint("Test Team", 1, 0, 12345, "Alice")
+        self.game_state.complete_challenge("Test Team", 1, 5, {})
+        
+        self.game_state.set_challenge_completion_time("Test Team", 1, "2025-01-01T10:00:00")
+        self.assertEqual(self.game_state.get_challenge_unlock_time("Test Team", 2), "2025-01-01T10:02:00")
+        
+        # Direct edits to the stored ISO string are picked up as well
+        self.game_state.teams["Test Team"]['challenge_completion_times']['1'] = "2025-01-01T11:30:00"
+        self.assertEqual(self.game_state.get_challenge_unlock_time("Test Team", 2), "2025-01-01T11:32:00")
+    
+    def test_unlock_time_follows_penalty_changes(self):
+        """Test that repeated unlock queries pick up new hints and custom penalties."""
+        self.game_state.use_hint("Test Team", 1, 0, 12345, "Alice")
+        self.game_state.complete_challenge("Test Team", 1, 5, {})
+        self.game_state.set_challenge_completion_time("Test Team", 1, "2025-01-01T10:00:00")
+        self.assertEqual(self.game_state.get_challenge_unlock_time("Test Team", 2), "2025-01-01T10:02:00")
+        self.assertEqual(self.game_state.get_challenge_unlock_time("Test Team", 2), "2025-01-01T10:02:00")
+        
+        self.game_state.use_hint("Test Team", 1, 1, 12345, "Alice")
+        self.assertEqual(self.game_state.get_challenge_unlock_time("Test Team", 2), "2025-01-01T10:04:00")
+        self.assertEqual(self.game_state.get_challenge_unlock_time("Test Team", 2, {'timeout_penalty_minutes': 5}),
+                         "2025-01-01T10:10:00")
+    
+    def test_unlock_timestamp_matches_unlock_time(self):
+        """Test that the epoch unlock time agrees with the ISO unlock time."""
+        self.assertIsNone(self.game_state.get_challenge_unlock_timestamp("Test Team", 2))
+        
+        self.game_state.use_hint("Test Team", 1, 0, 12345, "Alice")
+        self.game_state.complete_challenge("Test Team", 1, 5, {})
+        self.game_state.set_challenge_completion_time("Test Team", 1, "2025-01-01T10:00:00")
+        
+        unlock_timestamp = self.game_state.get_challenge_unlock_timestamp("Test Team", 2)
+        self.assertEqual(unlock_timestamp, datetime(2025, 1, 1, 10, 2).timestamp())
+        self.assertEqual(datetime.fromtimestamp(unlock_timestamp).isoformat(),
+                         self.game_state.get_challenge_unlock_time("Test Team", 2))
+    
+    def test_unlock_time_after_reload(self):
+        """Test that unlock times are available straight after reloading state."""
+        self.game_state.use_hint("Test Team", 1, 0, 12345, "Alice")
+        self.game_state.complete_challenge("Test Team", 1, 5, {})
+        self.game_state.set_challenge_completion_time("Test Team", 1, "2025-01-01T10:00:00")
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(new_game_state.get_challenge_unlock_time("Test Team", 2), "2025-01-01T10:02:00")
+    
     def test_reset_game_clears_hints(self):
         """Test that resetting the game clears hint usage."""
         # Use some hints
@@ -168,6 +217,19 @@ class TestHintsFeature(unittest.TestCase):
         
         # Verify hints were cleared
         self.assertEqual(len(self.game_state.hint_usage), 0)
+        self.assertEqual(self.game_state.get_hint_count("Test Team", 1), 0)
+    
+    def test_hint_count_rebuilt_on_load(self):
+        """Test that hint counts are rebuilt when state is reloaded without a full save."""
+        self.game_state.use_hint("Test Team", 1, 0, 12345, "Alice")
+        self.game_state.use_hint("Test Team", 1, 1, 67890, "Bob")
+        self.game_state.use_hint("Test Team", 2, 0, 12345, "Alice")
+        
+        new_game_state = GameState(self.test_state_file)
+        
+        self.assertEqual(new_game_state.get_hint_count("Test Team", 1), 2)
+        self.assertEqual(new_game_state.get_hint_count("Test Team", 2), 1)
+        self.assertEqual(new_game_state.get_hint_count("Test Team", 3), 0)
     
     def test_use_hint_nonexistent_team(self):
         """Test that using hint for nonexistent team fails."""
@@ -6,7 +6,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 from bot import AmazingRaceBot
-from game_state import GameState
+from game_state import GameState, state_file_paths
 
 
 class TestImageSupport(unittest.IsolatedAsyncioTestCase):
@@ -67,8 +67,9 @@ class TestImageSupport(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_validate_image_url_https(self):
         """Test that HTTPS URLs are accepted."""
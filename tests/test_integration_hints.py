@@ -6,6 +6,11 @@ import os
 import yaml
 import sys
 
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
 
 def test_bot_initialization_with_hints():
     """Test that bot initializes correctly with hints in config."""
@@ -64,7 +69,7 @@ def test_bot_initialization_with_hints():
     try:
         # Write test config
         with open(test_config_file, 'w') as f:
-            yaml.dump(test_config, f)
+            yaml.dump(test_config, f, Dumper=_Dumper)
         
         # Import bot module
         from bot import AmazingRaceBot
@@ -5,7 +5,7 @@ This test verifies the complete workflow described in the issue.
 import unittest
 import os
 from datetime import datetime, timedelta
-from game_state import GameState
+from game_state import GameState, state_file_paths
 
 # Test constants
 TIME_TOLERANCE_SECONDS = 5  # Tolerance for time comparisons
@@ -24,8 +24,9 @@ class TestPhotoVerificationTimeoutWorkflow(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test files."""
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_workflow_with_photo_verification_and_penalty(self):
         """
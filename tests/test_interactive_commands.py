@@ -6,6 +6,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestInteractiveCommands(unittest.IsolatedAsyncioTestCase):
@@ -52,8 +53,9 @@ class TestInteractiveCommands(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_createteam_without_args_waits_for_input(self):
         """Test /createteam without args asks for team name."""
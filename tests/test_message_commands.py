@@ -6,6 +6,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestMessageCommand(unittest.IsolatedAsyncioTestCase):
@@ -51,8 +52,9 @@ class TestMessageCommand(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_message_command_admin_only(self):
         """Test that /message command is admin-only."""
@@ -216,8 +218,9 @@ class TestBroadcastCommand(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_broadcast_command_admin_only(self):
         """Test that /broadcast command is admin-only."""
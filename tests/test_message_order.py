@@ -9,6 +9,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, call
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestMessageOrdering(unittest.IsolatedAsyncioTestCase):
@@ -55,8 +56,9 @@ class TestMessageOrdering(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_completion_message_sent_before_next_challenge(self):
         """Test that completion message is sent before next challenge message."""
@@ -8,6 +8,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestMultiChoiceChallengeFix(unittest.IsolatedAsyncioTestCase):
@@ -78,8 +79,9 @@ class TestMultiChoiceChallengeFix(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_multi_choice_no_photo_verification_with_global_enabled(self):
         """Test that multi_choice doesn't require photo verification even when global setting is enabled."""
@@ -241,8 +243,9 @@ class TestMultiChoiceChallengeFix(unittest.IsolatedAsyncioTestCase):
         finally:
             if os.path.exists(test_file):
                 os.remove(test_file)
-            if os.path.exists("game_state.json"):
-                os.remove("game_state.json")
+            for path in state_file_paths("game_state.json"):
+                if os.path.exists(path):
+                    os.remove(path)
 
 
 if __name__ == '__main__':
@@ -3,6 +3,7 @@ Unit tests for the /pass command functionality.
 """
 import unittest
 import os
+import json
 from game_state import GameState
 
 
@@ -24,6 +25,9 @@ class TestPassCommand(unittest.TestCase):
         """Clean up test files."""
         if os.path.exists(self.test_state_file):
             os.remove(self.test_state_file)
+        for path in (self.game_state.journal_file, self.game_state.audit_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_pass_team_basic(self):
         """Test basic pass_team functionality."""
@@ -155,6 +159,16 @@ class TestPassCommand(unittest.TestCase):
         self.assertIn('1', completion_times)
         self.assertIsNotNone(completion_times['1'])
     
+    def test_pass_team_timestamps_consistent(self):
+        """Test that every timestamp recorded by one pass_team call is identical."""
+        self.game_state.pass_team("Team Alpha", 1, 999, "AdminTest")
+        
+        team = self.game_state.teams["Team Alpha"]
+        timestamp = team['challenge_submissions']['1']['timestamp']
+        self.assertEqual(team['challenge_completion_times']['1'], timestamp)
+        self.assertEqual(team['finish_time'], timestamp)
+        self.assertEqual(self.game_state.admin_audit_log[-1]['timestamp'], timestamp)
+    
     def test_pass_team_persistence(self):
         """Test that pass_team changes are persisted."""
         self.game_state.pass_team("Team Alpha", 5, 999, "AdminTest")
@@ -192,6 +206,32 @@ class TestPassCommand(unittest.TestCase):
         
         self.game_state.reset_game()
         self.assertEqual(len(self.game_state.admin_audit_log), 0)
+    
+    def test_audit_log_appended_outside_snapshot(self):
+        """Test that audit entries go to the append-only audit file, not the state snapshot."""
+        self.game_state.pass_team("Team Alpha", 5, 999, "AdminTest")
+        self.game_state.pass_team("Team Beta", 5, 999, "AdminTest")
+        self.game_state.save_state()
+        
+        with open(self.test_state_file) as f:
+            self.assertNotIn('admin_audit_log', json.load(f))
+        entries = list(self.game_state.iter_audit_log())
+        self.assertEqual([entry['team_name'] for entry in entries], ['Team Alpha', 'Team Beta'])
+    
+    def test_audit_log_migrated_from_snapshot(self):
+        """Test that an audit log stored in an older snapshot is moved to the audit file."""
+        self.game_state.save_state()
+        with open(self.test_state_file) as f:
+            data = json.load(f)
+        data['admin_audit_log'] = [{'action': 'pass_team', 'team_name': 'Team Alpha', 'challenge_id': 1,
+                                    'admin_id': 999, 'admin_name': 'AdminTest',
+                                    'timestamp': '2025-01-01T10:00:00'}]
+        with open(self.test_state_file, 'w') as f:
+            json.dump(data, f)
+        
+        new_game_state = GameState(self.test_state_file)
+        self.assertEqual(new_game_state.admin_audit_log, data['admin_audit_log'])
+        self.assertTrue(os.path.exists(new_game_state.audit_file))
 
 
 if __name__ == '__main__':
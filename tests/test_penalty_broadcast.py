@@ -7,6 +7,7 @@ import yaml
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch, call
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestPenaltyBroadcast(unittest.IsolatedAsyncioTestCase):
@@ -58,8 +59,9 @@ class TestPenaltyBroadcast(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_penalty_notification_broadcast_to_all_team_members(self):
         """Test that penalty notification is broadcast to all team members when challenge is completed."""
@@ -6,7 +6,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
-from game_state import GameState
+from game_state import GameState, state_file_paths
 
 
 class TestPhotoVerification(unittest.TestCase):
@@ -51,10 +51,12 @@ class TestPhotoVerification(unittest.TestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_photo_verification_state_persistence(self):
         """Test that photo verification state is saved and loaded."""
@@ -228,10 +230,12 @@ class TestPhotoVerificationBypass(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_submit_answer_requires_photo_verification_when_enabled(self):
         """Test that submitting an answer requires photo verification when enabled."""
@@ -437,10 +441,12 @@ class TestPhotoVerificationCommands(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_togglephotoverify_command_admin(self):
         """Test togglephotoverify command by admin."""
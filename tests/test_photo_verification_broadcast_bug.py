@@ -7,6 +7,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestPhotoVerificationBroadcastBug(unittest.IsolatedAsyncioTestCase):
@@ -49,7 +50,8 @@ class TestPhotoVerificationBroadcastBug(unittest.IsolatedAsyncioTestCase):
         
     def tearDown(self):
         """Clean up test files."""
-        for file in [self.test_config_file, self.test_state_file, "game_state.json"]:
+        for file in [self.test_config_file, *state_file_paths(self.test_state_file),
+                     *state_file_paths("game_state.json")]:
             if os.path.exists(file):
                 os.remove(file)
     
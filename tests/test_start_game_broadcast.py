@@ -8,6 +8,44 @@ import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch, call
 from bot import AmazingRaceBot
 
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+# Minimal config shared by every test
+CONFIG = {
+    'telegram': {'bot_token': 'test_token'},
+    'game': {
+        'name': 'Test Game',
+        'max_teams': 10,
+        'max_team_size': 5,
+        'challenges': [
+            {
+                'id': 1,
+                'name': 'Challenge 1',
+                'description': 'First challenge description',
+                'location': 'Starting Point',
+                'type': 'riddle',
+                'verification': {'method': 'answer', 'answer': 'test'},
+                'hints': ['Hint 1', 'Hint 2']
+            },
+            {
+                'id': 2,
+                'name': 'Challenge 2',
+                'description': 'Second challenge description',
+                'location': 'Second Location',
+                'type': 'photo',
+                'verification': {'method': 'photo'}
+            }
+        ]
+    },
+    'admin': 999999999
+}
+
+# The config never changes between tests, so serialize it once at import
+_SERIALIZED_CONFIG = yaml.dump(CONFIG, Dumper=_Dumper).encode()
+
 
 class TestStartGameBroadcast(unittest.TestCase):
     """Test cases for the /startgame command broadcast functionality."""
@@ -16,38 +54,8 @@ class TestStartGameBroadcast(unittest.TestCase):
         """Set up test fixtures."""
         self.test_config_file = "test_start_game_broadcast_config.yml"
         
-        # Create a minimal config
-        config = {
-            'telegram': {'bot_token': 'test_token'},
-            'game': {
-                'name': 'Test Game',
-                'max_teams': 10,
-                'max_team_size': 5,
-                'challenges': [
-                    {
-                        'id': 1,
-                        'name': 'Challenge 1',
-                        'description': 'First challenge description',
-                        'location': 'Starting Point',
-                        'type': 'riddle',
-                        'verification': {'method': 'answer', 'answer': 'test'},
-                        'hints': ['Hint 1', 'Hint 2']
-                    },
-                    {
-                        'id': 2,
-                        'name': 'Challenge 2',
-                        'description': 'Second challenge description',
-                        'location': 'Second Location',
-                        'type': 'photo',
-                        'verification': {'method': 'photo'}
-                    }
-                ]
-            },
-            'admin': 999999999
-        }
-        
-        with open(self.test_config_file, 'w') as f:
-            yaml.dump(config, f)
+        with open(self.test_config_file, 'wb') as f:
+            f.write(_SERIALIZED_CONFIG)
         
         self.bot = AmazingRaceBot(self.test_config_file)
         
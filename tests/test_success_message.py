@@ -6,6 +6,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock, patch, call
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestSuccessMessage(unittest.IsolatedAsyncioTestCase):
@@ -66,8 +67,9 @@ class TestSuccessMessage(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_success_message_sent_on_text_answer(self):
         """Test that custom success message is sent after correct text answer."""
@@ -246,8 +248,9 @@ class TestSuccessMessagePhotoChallenge(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_success_message_sent_on_photo_approval(self):
         """Test that custom success message is sent when admin approves photo."""
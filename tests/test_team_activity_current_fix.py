@@ -9,6 +9,7 @@ from unittest.mock import MagicMock, AsyncMock
 from telegram import Update, User, Message
 
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestTeamActivityCurrentCommand(unittest.TestCase):
@@ -23,8 +24,9 @@ class TestTeamActivityCurrentCommand(unittest.TestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_current_command_photo_team_activity(self):
         """Test /current command for team_activity with photo verification."""
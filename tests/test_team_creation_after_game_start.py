@@ -7,6 +7,7 @@ import yaml
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestTeamCreationAfterGameStart(unittest.TestCase):
@@ -54,8 +55,9 @@ class TestTeamCreationAfterGameStart(unittest.TestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     @patch('bot.Update')
     @patch('bot.ContextTypes')
@@ -7,6 +7,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestTeamsAndLeaderboardCommands(unittest.IsolatedAsyncioTestCase):
@@ -52,8 +53,9 @@ class TestTeamsAndLeaderboardCommands(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_leaderboard_admin_only(self):
         """Test that /leaderboard is only accessible to admins."""
@@ -5,7 +5,7 @@ import unittest
 import os
 import yaml
 from datetime import datetime, timedelta
-from game_state import GameState
+from game_state import GameState, state_file_paths
 
 
 class TestTimeoutDisplay(unittest.TestCase):
@@ -25,8 +25,9 @@ class TestTimeoutDisplay(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test files."""
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_challenge_unlock_time_calculation(self):
         """Test that unlock time is calculated correctly when hints are used."""
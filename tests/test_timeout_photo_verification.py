@@ -4,7 +4,7 @@ Unit tests for timeout behavior with photo verification.
 import unittest
 import os
 from datetime import datetime, timedelta
-from game_state import GameState
+from game_state import GameState, state_file_paths
 
 
 class TestTimeoutWithPhotoVerification(unittest.TestCase):
@@ -16,8 +16,9 @@ class TestTimeoutWithPhotoVerification(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test files."""
-        if os.path.exists(self.test_state_file):
-            os.remove(self.test_state_file)
+        for path in state_file_paths(self.test_state_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_completion_time_deferred_with_photo_verification_enabled(self):
         """Test that completion time is deferred when photo verification is enabled."""
@@ -3,6 +3,9 @@ Unit tests for tournament challenge functionality.
 """
 import unittest
 import os
+import json
+import random
+from unittest.mock import patch
 from game_state import GameState
 
 
@@ -24,6 +27,8 @@ class TestTournament(unittest.TestCase):
         """Clean up test files."""
         if os.path.exists(self.game_state.state_file):
             os.remove(self.game_state.state_file)
+        if os.path.exists(self.game_state.journal_file):
+            os.remove(self.game_state.journal_file)
     
     def test_create_tournament_even_teams(self):
         """Test creating a tournament with even number of teams."""
@@ -236,6 +241,61 @@ class TestTournament(unittest.TestCase):
         last_place = new_game_state.get_tournament_last_place(1)
         self.assertIsNotNone(last_place)
     
+    def test_round_advance_journaled_once(self):
+        """Test that a winner report that advances the round is journaled in one write."""
+        self.game_state.create_tournament(1, ["Alpha", "Beta", "Gamma", "Delta"], "Tournament")
+        matches = self.game_state.get_current_round_matches(1)
+        self.game_state.report_match_winner(1, matches[0]['team1'])
+        
+        with patch('builtins.open', wraps=open) as mock_open:
+            self.assertTrue(self.game_state.report_match_winner(1, matches[1]['team1']))
+        journal_writes = [call for call in mock_open.call_args_list
+                          if call.args[0] == self.game_state.journal_file]
+        self.assertEqual(len(journal_writes), 1)
+        
+        new_game_state = GameState("test_tournament.json")
+        self.assertEqual(new_game_state.get_tournament(1), self.game_state.get_tournament(1))
+        self.assertEqual(new_game_state.get_tournament(1)['current_round'], 1)
+    
+    def test_round_advances_after_reload(self):
+        """Test that a round reloaded mid-way advances once its last match is reported."""
+        self.game_state.create_tournament(1, ["Alpha", "Beta", "Gamma", "Delta", "Epsilon"], "Tournament")
+        matches = self.game_state.get_current_round_matches(1)
+        pending = [m for m in matches if m['status'] == 'pending']
+        self.assertEqual(len(pending), 2)
+        self.game_state.report_match_winner(1, pending[0]['team1'])
+        
+        new_game_state = GameState("test_tournament.json")
+        self.assertEqual(new_game_state.get_tournament(1)['current_round'], 0)
+        self.assertFalse(new_game_state.report_match_winner(1, pending[0]['team1']))
+        self.assertEqual(new_game_state.get_tournament(1)['current_round'], 0)
+        self.assertTrue(new_game_state.report_match_winner(1, pending[1]['team2']))
+        self.assertEqual(new_game_state.get_tournament(1)['current_round'], 1)
+        self.assertEqual(len(new_game_state.get_current_round_matches(1)), 2)
+    
+    def test_bracket_shuffle_uses_module_generator(self):
+        """Test that brackets are shuffled by the module generator, so a seeded one is reproducible."""
+        teams = ["Alpha", "Beta", "Gamma", "Delta"]
+        with patch('game_state._RNG', random.Random(7)):
+            self.game_state.create_tournament(1, teams, "Tournament")
+        with patch('game_state._RNG', random.Random(7)):
+            self.game_state.create_tournament(2, teams, "Tournament")
+        
+        self.assertEqual(self.game_state.get_tournament(1)['bracket'], self.game_state.get_tournament(2)['bracket'])
+        self.assertEqual(self.game_state.get_tournament(1)['teams'], teams)
+    
+    def test_tournaments_keyed_by_int_after_reload(self):
+        """Test that tournaments are keyed by int challenge ID in memory and by string on disk."""
+        self.game_state.create_tournament(3, ["Alpha", "Beta"], "Tournament")
+        self.game_state.save_state()
+        with open("test_tournament.json") as f:
+            self.assertEqual(list(json.load(f)["tournaments"]), ["3"])
+        
+        new_game_state = GameState("test_tournament.json")
+        self.assertEqual(list(new_game_state.tournaments), [3])
+        self.assertTrue(new_game_state.reset_tournament(3))
+        self.assertIsNone(GameState("test_tournament.json").get_tournament(3))
+    
     def test_single_team_tournament(self):
         """Test creating a tournament with only one team."""
         teams = ["Alpha"]
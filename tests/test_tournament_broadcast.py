@@ -6,6 +6,7 @@ import os
 import yaml
 from unittest.mock import AsyncMock, MagicMock
 from bot import AmazingRaceBot
+from game_state import state_file_paths
 
 
 class TestTournamentBroadcast(unittest.IsolatedAsyncioTestCase):
@@ -66,8 +67,9 @@ class TestTournamentBroadcast(unittest.IsolatedAsyncioTestCase):
         """Clean up test files."""
         if os.path.exists(self.test_config_file):
             os.remove(self.test_config_file)
-        if os.path.exists("game_state.json"):
-            os.remove("game_state.json")
+        for path in state_file_paths("game_state.json"):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_tournament_completion_broadcasts_next_challenge(self):
         """Test that completing a tournament broadcasts the next challenge to all teams."""
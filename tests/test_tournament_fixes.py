@@ -10,7 +10,7 @@ import os
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 from bot import AmazingRaceBot
-from game_state import GameState
+from game_state import GameState, state_file_paths
 
 
 class TestTournamentFixes(unittest.IsolatedAsyncioTestCase):
@@ -73,8 +73,9 @@ class TestTournamentFixes(unittest.IsolatedAsyncioTestCase):
     
     async def asyncTearDown(self):
         """Clean up test files."""
-        if os.path.exists(self.bot.game_state.state_file):
-            os.remove(self.bot.game_state.state_file)
+        for path in state_file_paths(self.bot.game_state.state_file):
+            if os.path.exists(path):
+                os.remove(path)
     
     async def test_submit_command_rejects_tournament(self):
         """Test that /submit command rejects submissions for tournament challenges."""